@@ -0,0 +1,60 @@
+""" Compare loading a validator tree from the schema cache against building it
+
+Builds a Dict with a number of String members, each with its own regex, like
+the generated schemas the cache is meant for. Before every run the regex cache
+of the re module is purged, like on a fresh worker start.
+
+    python benchmarks/cache.py [members]
+"""
+
+__author__ = 'schlitzer'
+
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+import validation
+from validation import cache
+
+
+def build_schema(members):
+    schema = validation.Dict()
+    for pos in range(members):
+        schema.required['member{0}'.format(pos)] = validation.String(regex='^[a-z]{{1,{0}}}x[0-9]+$'.format(pos + 1))
+    return schema
+
+
+def measure(function, repeat=5):
+    """ Best of repeat runs, with the regex cache purged before each
+    """
+    best = None
+    for _ in range(repeat):
+        re.purge()
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+if __name__ == '__main__':
+    members = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    directory = tempfile.mkdtemp()
+    try:
+        schema_cache = cache.SchemaCache(directory)
+
+        def builder():
+            return build_schema(members)
+
+        schema_cache.get(builder, members)
+        print("{0:25s} {1:.3f}s".format('build', measure(builder)))
+        print("{0:25s} {1:.3f}s".format('cache.get', measure(lambda: schema_cache.get(builder, members))))
+        item = {'member{0}'.format(pos): 'ax1' for pos in range(members)}
+        print("{0:25s} {1:.3f}s".format(
+            'cache.get and validate', measure(lambda: schema_cache.get(builder, members).validate(item))
+        ))
+    finally:
+        shutil.rmtree(directory)
@@ -0,0 +1,51 @@
+""" Measure how many documents the generator produces per second
+
+    python benchmarks/generate.py [count]
+"""
+
+__author__ = 'schlitzer'
+
+import datetime
+import sys
+import time
+
+import validation
+from validation import generate
+
+
+def build_schema():
+    address = validation.Dict(ignore_unknown=False)
+    address.required['city'] = validation.String(regex='^[A-Z][a-z]{2,10}$')
+    address.required['zip'] = validation.String(regex=r'^\d{5}$')
+    address.optional['street'] = validation.String()
+    schema = validation.Dict(ignore_unknown=False)
+    schema.required['_id'] = validation.StringUUID()
+    schema.required['name'] = validation.String(regex='^(John|Paula|Weirdo)( [A-Z]\\.)?$')
+    schema.required['gender'] = validation.Choice(choices=['male', 'female'])
+    schema.required['age'] = validation.Int(minval=0, maxval=150)
+    schema.required['active'] = validation.Bool()
+    schema.required['address'] = address
+    schema.optional['hobbies'] = validation.List(validation.String(regex='^[a-z]+$'), min_items=1, max_items=4)
+    schema.optional['tags'] = validation.List(validation.Int(minval=0, maxval=20), max_items=5, unique=True)
+    schema.optional['ip'] = validation.IP()
+    schema.optional['listen'] = validation.IPPort()
+    schema.optional['score'] = validation.Float()
+    schema.optional['created'] = validation.StringDateTime(require_tz=True)
+    schema.optional['born'] = validation.StringDate(maxval=datetime.date(2010, 1, 1))
+    schema.patterns[r'x-[a-z]{1,3}$'] = validation.Int(minval=0)
+    return schema
+
+
+def measure(schema, count, invalid):
+    start = time.perf_counter()
+    for _ in generate.generate(schema, count=count, seed=1, invalid=invalid):
+        pass
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    schema = build_schema()
+    for invalid in (False, True):
+        elapsed = measure(schema, count, invalid)
+        print("{0:10s} {1:.3f}s {2:.0f} documents/s".format('invalid' if invalid else 'valid', elapsed, count / elapsed))
@@ -0,0 +1,55 @@
+""" Measure the memory footprint of resident schemas
+
+Builds a number of schemas that look like a typical tenant schema and reports
+the memory allocated per schema, as seen by tracemalloc.
+
+    python benchmarks/memory.py [count]
+"""
+
+__author__ = 'schlitzer'
+
+import sys
+import tracemalloc
+
+import validation
+
+
+def build_schema():
+    schema = validation.Dict(ignore_unknown=False)
+    schema.required['_id'] = validation.StringUUID()
+    schema.required['name'] = validation.String()
+    schema.required['gender'] = validation.Choice(choices=['male', 'female'])
+    schema.required['active'] = validation.Bool()
+    schema.required['age'] = validation.Int(minval=0, maxval=150)
+    schema.required['score'] = validation.Float(minval=0.0, maxval=1.0)
+    schema.optional['hobbies'] = validation.List(validation.String())
+    schema.optional['ip'] = validation.IP()
+    schema.optional['ipv4'] = validation.IPv4()
+    schema.optional['ipv6'] = validation.IPv6()
+    schema.optional['listen'] = validation.IPPort()
+    schema.optional['listen4'] = validation.IPv4Port()
+    schema.optional['listen6'] = validation.IPv6Port()
+    location = validation.Tuple()
+    location.add_element(validation.Float())
+    location.add_element(validation.Float())
+    schema.optional['location'] = location
+    return schema
+
+
+def measure(count):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    schemas = [build_schema() for _ in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del schemas
+    return total
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    total = measure(count)
+    print("schemas: {0}".format(count))
+    print("total: {0:.1f} KiB".format(total / 1024))
+    print("per schema: {0:.0f} bytes".format(total / count))
@@ -0,0 +1,53 @@
+""" Compare sequential, process pool and shared memory validation of a numeric array
+
+The process pool variant pickles every chunk to its worker, the shared memory
+variant copies the array into a shared memory block once.
+
+    python benchmarks/shared.py [length]
+"""
+
+__author__ = 'schlitzer'
+
+import array
+import concurrent.futures
+import os
+import sys
+import time
+
+import validation
+from validation import shared
+
+
+def build_schema():
+    return validation.List(validation.Int(minval=0, maxval=1 << 20)).freeze()
+
+
+def _pickled_chunk(validator, chunk):
+    validator.validate(chunk)
+
+
+def run_pickled(validator, data, workers, chunksize=shared.CHUNKSIZE):
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_pickled_chunk, validator, data[start:start + chunksize])
+            for start in range(0, len(data), chunksize)
+        ]
+        for future in futures:
+            future.result()
+
+
+def measure(function, *args, **kwargs):
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    length = int(sys.argv[1]) if len(sys.argv) > 1 else 50000000
+    workers = os.cpu_count() or 1
+    validator = build_schema()
+    data = array.array('q', (pos % (1 << 20) for pos in range(length)))
+    print("array: {0} members, {1:.0f} MB".format(length, len(data) * data.itemsize / 1000000))
+    print("sequential:    {0:.3f}s".format(measure(validator.validate, data)))
+    print("process pool:  {0:.3f}s".format(measure(run_pickled, validator, data, workers)))
+    print("shared memory: {0:.3f}s".format(measure(shared.validate_array, validator, data, workers=workers)))
@@ -0,0 +1,59 @@
+""" Measure how threaded List validation scales with the number of workers
+
+Only free-threaded (no-GIL) CPython builds will show a speedup, with the GIL
+enabled the numbers show the threading overhead.
+
+    python benchmarks/threads.py [length]
+"""
+
+__author__ = 'schlitzer'
+
+import os
+import sys
+import time
+
+import validation
+from validation import threaded
+
+
+def build_schema():
+    schema = validation.Dict()
+    schema.required['_id'] = validation.StringUUID()
+    schema.required['name'] = validation.String(regex='^[A-Z][a-z]+$')
+    schema.required['age'] = validation.Int(minval=0, maxval=150)
+    schema.optional['hobbies'] = validation.List(validation.String())
+    return validation.List(schema).freeze()
+
+
+def build_payload(length):
+    return [
+        {
+            '_id': 'e7a5ff1c-ee5e-4ca9-a3d3-0106dd826dcd',
+            'name': 'John',
+            'age': pos % 150,
+            'hobbies': ['python', 'blarg', 'blub'],
+        }
+        for pos in range(length)
+    ]
+
+
+def run(validator, payload, workers):
+    start = time.perf_counter()
+    threaded.validate_list(validator, payload, workers=workers, force=True)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    length = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    validator = build_schema()
+    payload = build_payload(length)
+    print("gil enabled: {0}".format(threaded.gil_enabled()))
+    start = time.perf_counter()
+    validator.validate(payload)
+    baseline = time.perf_counter() - start
+    print("sequential: {0:.3f}s".format(baseline))
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        elapsed = run(validator, payload, workers)
+        print("workers {0:3d}: {1:.3f}s speedup {2:.2f}x".format(workers, elapsed, baseline / elapsed))
+        workers *= 2
@@ -0,0 +1,65 @@
+""" Compare StringDateTime against regex based timestamp validation
+
+    python benchmarks/timestamps.py [count]
+"""
+
+__author__ = 'schlitzer'
+
+import datetime
+import random
+import sys
+import time
+
+import validation
+
+REGEX = r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d{3}(\d{3})?)?(Z|[+-]\d{2}:\d{2})$'
+
+
+def build_payload(count):
+    rng = random.Random(1)
+    start = datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc)
+    return [
+        (start + datetime.timedelta(seconds=rng.randint(0, 1 << 30))).isoformat().replace('+00:00', 'Z')
+        for _ in range(count)
+    ]
+
+
+def regex_strptime(payload):
+    validator = validation.String(regex=REGEX)
+    for item in payload:
+        validator.validate(item)
+        datetime.datetime.strptime(item, '%Y-%m-%dT%H:%M:%S%z')
+
+
+def regex_fromisoformat(payload):
+    validator = validation.String(regex=REGEX)
+    for item in payload:
+        validator.validate(item)
+        datetime.datetime.fromisoformat(item.replace('Z', '+00:00'))
+
+
+def string_datetime(payload):
+    validator = validation.StringDateTime(require_tz=True)
+    for item in payload:
+        validator.parse(item)
+
+
+def measure(function, payload, repeat=5):
+    """ Best of repeat runs, so other load on the machine does not decide the order
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(payload)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    payload = build_payload(count)
+    for function in (regex_strptime, regex_fromisoformat, string_datetime):
+        elapsed = measure(function, payload)
+        print("{0:20s} {1:.3f}s {2:.0f} items/s".format(function.__name__, elapsed, count / elapsed))
@@ -1 +1,44 @@
 __author__ = 'schlitzer'
+
+import datetime
+
+import validation
+
+
+def build_user_schema():
+    """ Dict Type Validator covering every Type Validator, shared by the tests
+    """
+    address = validation.Dict(ignore_unknown=False)
+    address.required['city'] = validation.String(regex='^[A-Z][a-z]{2,10}$')
+    address.required['zip'] = validation.String(regex=r'^\d{5}$')
+    address.optional['street'] = validation.String()
+    location = validation.Tuple()
+    location.add_element(validation.Float(minval=-90.0, maxval=90.0))
+    location.add_element(validation.Float(minval=-180.0, maxval=180.0))
+    schema = validation.Dict(ignore_unknown=False)
+    schema.required['_id'] = validation.StringUUID()
+    schema.required['name'] = validation.String(regex='^(John|Paula|Weirdo)( [A-Z]\\.)?$')
+    schema.required['gender'] = validation.Choice(choices=['male', 'female'])
+    schema.required['age'] = validation.Int(minval=0, maxval=150)
+    schema.required['active'] = validation.Bool()
+    schema.required['address'] = address
+    schema.optional['hobbies'] = validation.List(validation.String(regex='^[a-z]+$'), min_items=1, max_items=4)
+    schema.optional['tags'] = validation.List(validation.Int(minval=0, maxval=20), max_items=5, unique=True)
+    schema.optional['location'] = location
+    schema.optional['ip'] = validation.IP()
+    schema.optional['ipv4'] = validation.IPv4()
+    schema.optional['ipv6'] = validation.IPv6()
+    schema.optional['listen'] = validation.IPPort()
+    schema.optional['listen4'] = validation.IPv4Port()
+    schema.optional['listen6'] = validation.IPv6Port()
+    schema.optional['score'] = validation.Float()
+    schema.optional['born'] = validation.StringDate(maxval=datetime.date(2010, 1, 1))
+    schema.optional['created'] = validation.StringDateTime(require_tz=True)
+    schema.optional['updated'] = validation.StringDateTime(
+        minval=datetime.datetime(2024, 1, 1, 12), maxval=datetime.datetime(2024, 1, 1, 13)
+    )
+    schema.optional['opens'] = validation.StringTime(minval=datetime.time(8), maxval=datetime.time(9))
+    schema.optional['closes'] = validation.StringTime(require_tz=True)
+    schema.patterns[r'x-[a-z]{1,3}$'] = validation.Int(minval=0)
+    schema.patterns[r'metric\.[a-z]+$'] = validation.Float()
+    return schema
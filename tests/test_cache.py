@@ -0,0 +1,208 @@
+__author__ = 'schlitzer'
+
+import datetime
+import functools
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import validation
+from validation import cache
+
+from tests import build_user_schema
+
+
+class TestSpec(TestCase):
+    def test_roundtrip(self):
+        schema = build_user_schema()
+        spec = cache.to_spec(schema)
+        self.assertEqual(json.loads(json.dumps(spec)), spec)
+        rebuilt = cache.from_spec(spec)
+        self.assertEqual(cache.to_spec(rebuilt), spec)
+        self.assertEqual(list(rebuilt.required), ['_id', 'name', 'gender', 'age', 'active', 'address'])
+        self.assertEqual(rebuilt.optional['hobbies'].max_items, 4)
+        self.assertEqual(list(rebuilt.patterns), [r'x-[a-z]{1,3}$', r'metric\.[a-z]+$'])
+        self.assertEqual(rebuilt.optional['closes'].require_tz, True)
+
+    def test_roundtrip_sample(self):
+        schema = validation.List(validation.Int(), sample=0.01, sample_edges=4, sample_seed=7)
+        spec = cache.to_spec(schema)
+        rebuilt = cache.from_spec(spec)
+        self.assertEqual(cache.to_spec(rebuilt), spec)
+        self.assertEqual(rebuilt.sampled_positions(10000), schema.sampled_positions(10000))
+
+    def test_roundtrip_temporal(self):
+        schema = validation.Dict()
+        schema.required['born'] = validation.StringDate(minval=datetime.date(1900, 1, 1))
+        schema.required['created'] = validation.StringDateTime(
+            maxval=datetime.datetime(2100, 1, 1, tzinfo=datetime.timezone.utc), require_tz=True
+        )
+        schema.optional['opens'] = validation.StringTime(minval=datetime.time(8, 30))
+        spec = cache.to_spec(schema)
+        self.assertEqual(json.loads(json.dumps(spec)), spec)
+        rebuilt = cache.from_spec(spec)
+        self.assertEqual(cache.to_spec(rebuilt), spec)
+        self.assertEqual(rebuilt.required['created'].maxval, datetime.datetime(2100, 1, 1, tzinfo=datetime.timezone.utc))
+        self.assertTrue(rebuilt.required['created'].require_tz)
+        self.assertEqual(rebuilt.optional['opens'].minval, datetime.time(8, 30))
+
+    def test_recursive(self):
+        schema = validation.Dict()
+        schema.optional['children'] = validation.List(schema)
+        self.assertRaises(ValueError, cache.to_spec, schema)
+
+    def test_custom_validator(self):
+        class Custom(validation.Base):
+            pass
+
+        self.assertRaises(ValueError, cache.to_spec, Custom())
+
+    def test_choices_not_json(self):
+        self.assertRaises(ValueError, cache.to_spec, validation.Choice(choices=[('a', 'b')]))
+
+    def test_unknown_type(self):
+        self.assertRaises(ValueError, cache.from_spec, {'type': 'Blarg'})
+
+
+class TestFingerprint(TestCase):
+    def test_stable(self):
+        self.assertEqual(cache.fingerprint(build_user_schema()), cache.fingerprint(build_user_schema()))
+
+    def test_schema_changed(self):
+        schema = build_user_schema()
+        schema.optional['blarg'] = validation.Bool()
+        self.assertNotEqual(cache.fingerprint(schema), cache.fingerprint(build_user_schema()))
+
+    def test_version_changed(self):
+        fingerprint = cache.fingerprint(build_user_schema())
+        with patch.object(validation, '__version__', '99.0.0'):
+            self.assertNotEqual(cache.fingerprint(build_user_schema()), fingerprint)
+
+
+class TestSchemaCache(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.cache = cache.SchemaCache(self.directory)
+
+    def test_store_load(self):
+        fingerprint = self.cache.store('users', build_user_schema())
+        self.assertEqual(fingerprint, cache.fingerprint(build_user_schema()))
+        loaded = self.cache.load('users')
+        self.assertEqual(cache.fingerprint(loaded), fingerprint)
+
+    def test_load_missing(self):
+        self.assertIsNone(self.cache.load('users'))
+
+    def test_load_other_version(self):
+        self.cache.store('users', build_user_schema())
+        with patch.object(validation, '__version__', '99.0.0'):
+            self.assertIsNone(self.cache.load('users'))
+
+    def test_load_corrupted(self):
+        self.cache.store('users', build_user_schema())
+        path = os.path.join(self.directory, 'users.json')
+        with open(path) as handle:
+            entry = json.load(handle)
+        entry['spec']['required'][0][0] = 'blarg'
+        with open(path, 'w') as handle:
+            json.dump(entry, handle)
+        self.assertIsNone(self.cache.load('users'))
+
+    def test_load_garbage(self):
+        with open(os.path.join(self.directory, 'users.json'), 'w') as handle:
+            handle.write('blarg')
+        self.assertIsNone(self.cache.load('users'))
+
+    def test_get(self):
+        builder = Mock(wraps=build_user_schema)
+        first = self.cache.get(builder, key='users')
+        second = self.cache.get(builder, key='users')
+        self.assertEqual(builder.call_count, 1)
+        self.assertEqual(cache.fingerprint(first), cache.fingerprint(second))
+
+    def test_get_verify(self):
+        settings = Mock(minval=0)
+
+        def builder():
+            return validation.Int(minval=settings.minval)
+
+        self.cache.get(builder, key='age')
+        settings.minval = 1
+        self.assertEqual(cache.to_spec(self.cache.get(builder, key='age'))['minval'], 0)
+        self.assertEqual(cache.to_spec(self.cache.get(builder, key='age', verify=True))['minval'], 1)
+        self.assertEqual(cache.to_spec(self.cache.get(builder, key='age'))['minval'], 1)
+
+    def test_load_other_key(self):
+        self.cache.store('users', build_user_schema())
+        os.rename(os.path.join(self.directory, 'users.json'), os.path.join(self.directory, 'groups.json'))
+        self.assertIsNone(self.cache.load('groups'))
+
+    def test_load_expected(self):
+        self.cache.store('users', build_user_schema())
+        self.assertIsNotNone(self.cache.load('users', expected=cache.fingerprint(build_user_schema())))
+        self.assertIsNone(self.cache.load('users', expected=cache.fingerprint(validation.Int())))
+
+    def test_get_key(self):
+        self.assertNotEqual(cache.builder_key(build_user_schema, 1), cache.builder_key(build_user_schema, 2))
+        self.assertNotEqual(cache.builder_key(build_user_schema, 1), cache.builder_key(lambda: None, 1))
+        self.assertRaises(ValueError, cache.builder_key, build_user_schema, None)
+        self.assertRaises(TypeError, cache.builder_key, build_user_schema)
+
+    def test_get_key_closure(self):
+        def factory(maxval):
+            def builder():
+                return validation.Int(maxval=maxval)
+            return builder
+
+        self.assertNotEqual(cache.builder_key(factory(1), 1), cache.builder_key(factory(2), 1))
+        self.assertEqual(cache.builder_key(factory(1), 1), cache.builder_key(factory(1), 1))
+
+    def test_get_key_defaults(self):
+        def builder(maxval=1):
+            return validation.Int(maxval=maxval)
+
+        key = cache.builder_key(builder, 1)
+        builder.__defaults__ = (2,)
+        self.assertNotEqual(cache.builder_key(builder, 1), key)
+        builder.__defaults__ = (object(),)
+        self.assertTrue(cache.builder_key(builder, 1))
+
+    def test_get_key_partial(self):
+        first = cache.builder_key(functools.partial(build_user_schema), 1)
+        self.assertEqual(first, cache.builder_key(functools.partial(build_user_schema), 1))
+        self.assertTrue(first.startswith('tests.build_user_schema-'))
+        self.assertNotEqual(
+            cache.builder_key(functools.partial(validation.Int, maxval=1), 1),
+            cache.builder_key(functools.partial(validation.Int, maxval=2), 1)
+        )
+
+    def test_cached(self):
+        schema = cache.cached(build_user_schema, 1, directory=self.directory)
+        self.assertIsInstance(schema, validation.Dict)
+        self.assertEqual(len(os.listdir(self.directory)), 1)
+
+    def test_deferred_regex(self):
+        self.cache.store('users', build_user_schema())
+        loaded = self.cache.load('users')
+        name = loaded.required['name']
+        self.assertIsNotNone(name._source)
+        self.assertEqual(cache.to_spec(loaded), cache.to_spec(build_user_schema()))
+        self.assertIsNotNone(name._source)
+        self.assertRaises(validation.ValidationError, name.validate, 'blarg')
+        self.assertIsNone(name._source)
+        self.assertIsNone(name.validate('John'))
+        self.assertEqual(name.regex.pattern, build_user_schema().required['name'].regex.pattern)
+
+
+class TestDefaultDirectory(TestCase):
+    def test_env(self):
+        with patch.dict(os.environ, {'VALIDATION_CACHE_DIR': '/tmp/blarg'}):
+            self.assertEqual(cache.default_directory(), '/tmp/blarg')
+
+    def test_xdg(self):
+        with patch.dict(os.environ, {'VALIDATION_CACHE_DIR': '', 'XDG_CACHE_HOME': '/tmp/xdg'}):
+            self.assertEqual(cache.default_directory(), '/tmp/xdg/validation')
@@ -0,0 +1,193 @@
+__author__ = 'schlitzer'
+
+import array
+from unittest import TestCase, skipUnless
+
+import validation
+from validation import columnar
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+def rows(columns):
+    keys = list(columns)
+    return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
+
+class ArrowStyle(object):
+    """ Column without a numpy dtype, iterating over wrapped scalars like Arrow arrays
+    """
+    def __init__(self, values):
+        self.values = values
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        return iter([object() for _ in self.values])
+
+    def to_pylist(self):
+        return list(self.values)
+
+
+class TestFailingRows(TestCase):
+    def setUp(self):
+        self.dicttype = validation.Dict()
+        self.dicttype.required['age'] = validation.Int(minval=0, maxval=150)
+        self.dicttype.required['gender'] = validation.Choice(choices=['male', 'female'])
+        self.dicttype.optional['name'] = validation.String(regex='^[A-Z]')
+        self.dicttype.optional['active'] = validation.Bool()
+        self.strict = validation.Dict(ignore_unknown=False)
+        self.strict.required.update(self.dicttype.required)
+        self.strict.optional.update(self.dicttype.optional)
+
+    def test_valid(self):
+        columns = {
+            'age': [1, 2, 3],
+            'gender': ['male', 'female', 'male'],
+            'name': ['John', 'Paula', 'Weirdo'],
+            'active': [True, False, True],
+        }
+        self.assertEqual(columnar.failing_rows(self.dicttype, columns), [])
+
+    def test_matches_dict_validate(self):
+        columns = {
+            'age': [1, -2, 3, 'blarg', 5],
+            'gender': ['male', 'female', 'all of them', 'male', 'female'],
+            'name': ['John', 'Paula', 'Weirdo', 'john', 'paula'],
+            'active': [True, False, True, None, False],
+        }
+        schema = self.dicttype
+        expected = []
+        for row, item in enumerate(rows(columns)):
+            try:
+                schema.validate(item)
+            except validation.ValidationError as err:
+                expected.append((row, str(err)))
+        self.assertEqual(columnar.failing_rows(schema, columns), expected)
+        self.assertEqual([row for row, _ in expected], [1, 2, 3, 4])
+
+    def test_required_missing(self):
+        columns = {'age': [1, 2]}
+        self.assertEqual(
+            columnar.failing_rows(self.dicttype, columns),
+            [(0, 'required member gender missing'), (1, 'required member gender missing')]
+        )
+
+    def test_unknown_members(self):
+        columns = {'age': [1], 'gender': ['male'], 'blarg': [1]}
+        self.assertEqual(columnar.failing_rows(self.dicttype, columns), [])
+        self.assertEqual(
+            columnar.failing_rows(self.strict, columns),
+            [(0, "got unknown members: {'blarg'}")]
+        )
+
+    def test_patterns(self):
+        schema = self.strict
+        schema.patterns[r'metric\.'] = validation.Float(minval=0.0)
+        columns = {'age': [1, 2, 3], 'gender': ['male'] * 3, 'metric.load': [0.5, -1.0, 'x'], 'metric.free': [1.0] * 3}
+        self.assertEqual(columnar.failing_rows(schema, columns), [
+            (1, 'pattern member metric.load -1.0 is smaller then minimum value 0.0'),
+            (2, 'pattern member metric.load x is not a float'),
+        ])
+        for row, (pos, message) in zip(rows(columns)[1:], columnar.failing_rows(schema, columns)):
+            with self.assertRaises(validation.ValidationError) as err:
+                schema.validate(row)
+            self.assertEqual(str(err.exception), message)
+        columns['blarg'] = [1, 2, 3]
+        self.assertEqual(columnar.failing_rows(schema, columns)[0], (0, "got unknown members: {'blarg'}"))
+
+    def test_nan(self):
+        schema = validation.Dict()
+        schema.required['x'] = validation.Float(minval=0.0, maxval=1.0)
+        nan = float('nan')
+        self.assertEqual(
+            columnar.failing_rows(schema, {'x': [nan, -1.0, 0.5, 2.0]}),
+            [(1, 'required member x -1.0 is smaller then minimum value 0.0'),
+             (3, 'required member x 2.0 is bigger then maximum value 1.0')]
+        )
+        self.assertEqual(columnar.failing_rows(schema, {'x': [nan, 0.5]}), [])
+
+    def test_unequal_columns(self):
+        columns = {'age': [1, 2], 'gender': ['male']}
+        self.assertRaises(validation.ValidationError, columnar.failing_rows, self.dicttype, columns)
+
+    def test_no_dict(self):
+        self.assertRaises(ValueError, columnar.failing_rows, validation.Int(), {})
+
+    def test_array(self):
+        columns = {'age': array.array('q', [1, 200, 3]), 'gender': ('male', 'male', 'male')}
+        self.assertEqual(
+            columnar.failing_rows(self.dicttype, columns),
+            [(1, 'required member age 200 is bigger then maximum value 150')]
+        )
+
+    @skipUnless(numpy, 'requires numpy')
+    def test_numpy(self):
+        columns = {'age': numpy.array([1, 200, -3]), 'gender': numpy.array(['male', 'male', 'male'], dtype=object)}
+        self.assertEqual(
+            columnar.failing_rows(self.dicttype, columns),
+            [
+                (1, 'required member age 200 is bigger then maximum value 150'),
+                (2, 'required member age -3 is smaller then minimum value 0'),
+            ]
+        )
+
+    def test_arrow_style(self):
+        columns = {'age': ArrowStyle([1, 200, 3]), 'gender': ArrowStyle(['male', 'male', 'x'])}
+        self.assertEqual(
+            columnar.failing_rows(self.dicttype, columns),
+            [
+                (1, 'required member age 200 is bigger then maximum value 150'),
+                (2, "required member gender should be any of ['male', 'female'] actually is: x"),
+            ]
+        )
+
+    @skipUnless(pyarrow and numpy, 'requires pyarrow and numpy')
+    def test_pyarrow(self):
+        columns = {'age': pyarrow.array([1, 200, None]), 'gender': pyarrow.array(['male', 'male', 'male'])}
+        self.assertEqual(
+            columnar.failing_rows(self.dicttype, columns),
+            [
+                (1, 'required member age 200 is bigger then maximum value 150'),
+                (2, 'required member age None is not a integer'),
+            ]
+        )
+        columns['age'] = pyarrow.array([1, 200, 3])
+        self.assertEqual(
+            columnar.failing_rows(self.dicttype, columns),
+            [(1, 'required member age 200 is bigger then maximum value 150')]
+        )
+
+    @skipUnless(numpy, 'requires numpy')
+    def test_numpy_wrong_kind(self):
+        columns = {'age': numpy.array([1.0]), 'gender': ['male']}
+        self.assertEqual(
+            columnar.failing_rows(self.dicttype, columns),
+            [(0, 'required member age 1.0 is not a integer')]
+        )
+
+
+class TestValidateColumns(TestCase):
+    def setUp(self):
+        self.dicttype = validation.Dict()
+        self.dicttype.required['age'] = validation.Int(minval=0, maxval=150)
+        self.dicttype.required['gender'] = validation.Choice(choices=['male', 'female'])
+
+    def test_valid(self):
+        columns = {'age': [1, 2], 'gender': ['male', 'female']}
+        self.assertIsNone(columnar.validate_columns(self.dicttype, columns))
+
+    def test_invalid(self):
+        columns = {'age': [1, 2, 300], 'gender': ['male', 'blarg', 'female']}
+        with self.assertRaises(validation.ValidationError) as err:
+            columnar.validate_columns(self.dicttype, columns)
+        self.assertTrue(str(err.exception).startswith('row [1] required member gender'))
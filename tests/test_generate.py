@@ -0,0 +1,77 @@
+__author__ = 'schlitzer'
+
+import re
+from unittest import TestCase
+
+import validation
+from validation import generate
+
+from tests import build_user_schema
+
+
+class TestGenerate(TestCase):
+    def test_valid(self):
+        schema = build_user_schema()
+        for document in generate.generate(schema, count=500, seed=1):
+            schema.validate(document)
+
+    def test_count(self):
+        self.assertEqual(len(list(generate.generate(validation.Int(), count=7))), 7)
+
+    def test_seed(self):
+        first = list(generate.generate(build_user_schema(), count=10, seed=42))
+        second = list(generate.generate(build_user_schema(), count=10, seed=42))
+        self.assertEqual(first, second)
+
+    def test_invalid(self):
+        schema = build_user_schema()
+        for document in generate.generate(schema, count=500, seed=2, invalid=True):
+            self.assertRaises(validation.ValidationError, schema.validate, document)
+
+    def test_invalid_path(self):
+        schema = build_user_schema()
+        for path in ['/address/zip', '/hobbies/2', '/location/1', '/tags', '/address', '/name', '/x-abc', '/metric.load', '']:
+            for document in generate.generate(schema, count=20, seed=3, invalid=True, path=path):
+                self.assertRaises(validation.ValidationError, schema.validate, document)
+                self.assertRaises(validation.ValidationError, schema.validate_at, document, path)
+
+    def test_patterns(self):
+        documents = list(generate.generate(build_user_schema(), count=50, seed=4))
+        self.assertTrue(any(key.startswith('x-') for document in documents for key in document))
+        self.assertTrue(any(key.startswith('metric.') for document in documents for key in document))
+
+    def test_recursive(self):
+        schema = validation.Dict()
+        schema.required['name'] = validation.String()
+        schema.optional['children'] = validation.List(schema, max_items=2)
+        for document in generate.generate(schema, count=50, seed=4):
+            schema.validate(document)
+
+    def test_unsupported(self):
+        class Custom(validation.Base):
+            pass
+
+        self.assertRaises(ValueError, generate.compile_generator, Custom())
+
+
+class TestRegex(TestCase):
+    def test_patterns(self):
+        patterns = [
+            r'^[a-f0-9]{8}-[a-f0-9]{4}$',
+            r'^(foo|bar)+baz?$',
+            r'^\w+@\w+\.(com|org)$',
+            r'^[^a-z]{3}\s\S\D\W.$',
+            r'^(ab)\1$',
+            r'^x*?y+?z{2,}$',
+            r'^(?:a|b)(?=c)c$',
+        ]
+        rng = generate.random.Random(5)
+        for pattern in patterns:
+            compiled = re.compile(pattern)
+            generator = generate._regex_generator(compiled)
+            for _ in range(50):
+                self.assertTrue(compiled.match(generator(rng)), pattern)
+
+    def test_impossible(self):
+        generator = generate._regex_generator(re.compile('^a(?!b)b'))
+        self.assertRaises(ValueError, generator, generate.random.Random(6))
@@ -0,0 +1,106 @@
+__author__ = 'schlitzer'
+
+import io
+import json
+import mmap
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+import validation
+from validation import __main__ as cli
+
+
+schema = validation.Dict()
+schema.required['name'] = validation.String()
+schema.optional['age'] = validation.Int(minval=0)
+
+
+class TestLoadSchema(TestCase):
+    def test_colon(self):
+        self.assertIs(cli.load_schema('tests.test_main:schema'), schema)
+
+    def test_dotted(self):
+        self.assertIs(cli.load_schema('tests.test_main.schema'), schema)
+
+    def test_factory(self):
+        self.assertIsInstance(cli.load_schema('tests:build_user_schema'), validation.Dict)
+
+    def test_no_validator(self):
+        self.assertRaises(ValueError, cli.load_schema, 'tests.test_main:TestCase')
+
+    def test_no_attribute(self):
+        self.assertRaises(ValueError, cli.load_schema, 'tests')
+
+
+class TestValidateFile(TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.ndjson')
+        self.addCleanup(os.remove, self.path)
+        lines = []
+        for pos in range(100):
+            lines.append(json.dumps({'name': 'user{0}'.format(pos), 'age': pos}))
+        lines[10] = json.dumps({'name': 'user10', 'age': -1})
+        lines[50] = '{broken'
+        lines[70] = ''
+        lines[99] = json.dumps({'age': 1})
+        with os.fdopen(handle, 'w') as ndjson:
+            ndjson.write('\n'.join(lines))
+
+    def test_validate(self):
+        errors, latencies = cli.validate_file(schema, self.path)
+        self.assertEqual([line for line, _ in errors], [11, 51, 100])
+        self.assertEqual(errors[2], (100, 'required member name missing'))
+        self.assertEqual(len(latencies), 99)
+
+    def test_validator_exceptions(self):
+        with open(self.path, 'w') as ndjson:
+            ndjson.write('{"listen": "1.2.3.4"}\n{"listen": 5}\n{"listen": "1.2.3.4:80"}\n')
+        dicttype = validation.Dict()
+        dicttype.required['listen'] = validation.IPv4Port()
+        errors, latencies = cli.validate_file(dicttype, self.path)
+        self.assertEqual([line for line, _ in errors], [1, 2])
+        self.assertTrue(errors[0][1].startswith('ValueError: '))
+        self.assertEqual(len(latencies), 3)
+        with open(self.path, 'w') as ndjson:
+            ndjson.write('{"x": 5}\n5\n')
+        errors, _ = cli.validate_file(validation.List(validation.Int()), self.path)
+        self.assertEqual(errors[0], (1, 'is not a list'))
+        self.assertTrue(errors[1][1].startswith('TypeError: '))
+
+    def test_validate_workers(self):
+        errors, latencies = cli.validate_file('tests.test_main:schema', self.path, workers=3)
+        self.assertEqual(errors, cli.validate_file(schema, self.path)[0])
+        self.assertEqual(len(latencies), 99)
+
+    def test_validate_workers_needs_spec(self):
+        self.assertRaises(ValueError, cli.validate_file, schema, self.path, workers=2)
+
+    def test_ranges(self):
+        with open(self.path, 'rb') as handle:
+            data = handle.read()
+        with open(self.path, 'rb') as handle:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                ranges = cli._ranges(mm, len(data), 7)
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], len(data))
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, start)
+            self.assertEqual(data[start - 1:start], b'\n')
+
+    def test_main(self):
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        with patch('sys.stdout', stdout), patch('sys.stderr', stderr):
+            self.assertEqual(cli.main(['tests.test_main:schema', self.path]), 1)
+        self.assertEqual(len(stdout.getvalue().splitlines()), 3)
+        self.assertTrue(stdout.getvalue().startswith('11: optional member age'))
+        self.assertIn('documents: 99 invalid: 3', stderr.getvalue())
+        self.assertIn('p99', stderr.getvalue())
+
+    def test_main_empty(self):
+        with open(self.path, 'w'):
+            pass
+        with patch('sys.stdout', io.StringIO()), patch('sys.stderr', io.StringIO()):
+            self.assertEqual(cli.main(['tests.test_main:schema', self.path]), 0)
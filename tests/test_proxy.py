@@ -0,0 +1,144 @@
+__author__ = 'schlitzer'
+
+from unittest import TestCase
+from unittest.mock import Mock
+
+import validation
+from validation import proxy
+
+
+class TestLazy(TestCase):
+    def setUp(self):
+        address = validation.Dict()
+        address.required['city'] = validation.String()
+        address.optional['zip'] = validation.Int()
+        location = validation.Tuple()
+        location.add_element(validation.Float())
+        location.add_element(validation.Float())
+        self.dicttype = validation.Dict(ignore_unknown=False)
+        self.dicttype.required['name'] = validation.String()
+        self.dicttype.required['address'] = address
+        self.dicttype.optional['tags'] = validation.List(validation.String(), max_items=3, unique=True)
+        self.dicttype.optional['location'] = location
+        self.item = {
+            'name': 'John',
+            'address': {'city': 'Berlin', 'zip': 10115},
+            'tags': ['a', 'b'],
+            'location': (52.5, 13.4),
+        }
+
+    def test_leaf(self):
+        self.assertEqual(validation.lazy(validation.Int(), 1), 1)
+        self.assertRaises(validation.ValidationError, validation.lazy, validation.Int(), 'blarg')
+
+    def test_access(self):
+        item = self.item
+        lazy = validation.lazy(self.dicttype, item)
+        self.assertIsInstance(lazy, proxy.LazyDict)
+        self.assertEqual(lazy['name'], 'John')
+        self.assertEqual(lazy['address']['city'], 'Berlin')
+        self.assertEqual(lazy['tags'][-1], 'b')
+        self.assertEqual(lazy['tags'][0:2], ['a', 'b'])
+        self.assertEqual(lazy['location'][1], 13.4)
+        self.assertEqual(len(lazy), 4)
+        self.assertEqual(set(lazy), set(item))
+        self.assertIsNone(lazy.validate_rest())
+
+    def test_only_accessed_members_validated(self):
+        name = Mock()
+        schema = self.dicttype
+        schema.required['name'] = name
+        lazy = validation.lazy(schema, self.item)
+        self.assertEqual(lazy['address']['zip'], 10115)
+        self.assertFalse(name.validate.called)
+        lazy['name']
+        lazy['name']
+        self.assertEqual(name.validate.call_count, 1)
+
+    def test_invalid_member_on_access(self):
+        item = self.item
+        item['address']['zip'] = 'blarg'
+        lazy = validation.lazy(self.dicttype, item)
+        self.assertEqual(lazy['name'], 'John')
+        with self.assertRaises(validation.ValidationError) as err:
+            lazy['address']['zip']
+        with self.assertRaises(validation.ValidationError) as eager_err:
+            self.dicttype.validate(item)
+        self.assertEqual(str(err.exception), str(eager_err.exception))
+
+    def test_invalid_tuple_element(self):
+        item = self.item
+        item['location'] = (52.5, 'blarg')
+        lazy = validation.lazy(self.dicttype, item)
+        with self.assertRaises(validation.ValidationError) as err:
+            lazy['location'][1]
+        self.assertEqual(str(err.exception), 'optional member location [1]blarg is not a float')
+
+    def test_missing(self):
+        item = self.item
+        del item['name']
+        del item['tags']
+        lazy = validation.lazy(self.dicttype, item)
+        self.assertRaises(validation.ValidationError, lazy.__getitem__, 'name')
+        self.assertRaises(KeyError, lazy.__getitem__, 'tags')
+        self.assertIsNone(lazy.get('tags'))
+        self.assertFalse('tags' in lazy)
+
+    def test_unknown(self):
+        item = self.item
+        item['blarg'] = 1
+        lazy = validation.lazy(self.dicttype, item)
+        self.assertRaises(validation.ValidationError, lazy.__getitem__, 'blarg')
+        self.assertRaises(validation.ValidationError, lazy.validate_rest)
+
+    def test_patterns(self):
+        schema = self.dicttype
+        schema.patterns['x-'] = validation.Int()
+        item = self.item
+        item['x-a'] = 1
+        item['x-b'] = 'b'
+        lazy = validation.lazy(schema, item)
+        self.assertEqual(lazy['x-a'], 1)
+        with self.assertRaises(validation.ValidationError) as err:
+            lazy['x-b']
+        self.assertEqual(str(err.exception), 'pattern member x-b b is not a integer')
+        self.assertRaises(validation.ValidationError, lazy.validate_rest)
+        del item['x-b']
+        self.assertIsNone(validation.lazy(schema, item).validate_rest())
+        item['blarg'] = 1
+        self.assertRaises(validation.ValidationError, validation.lazy(schema, item).validate_rest)
+
+    def test_not_a_dict(self):
+        self.assertRaises(validation.ValidationError, validation.lazy, self.dicttype, [])
+
+    def test_validate_rest(self):
+        item = self.item
+        item['tags'] = ['a', 1]
+        lazy = validation.lazy(self.dicttype, item)
+        with self.assertRaises(validation.ValidationError) as err:
+            lazy.validate_rest()
+        self.assertEqual(str(err.exception), 'optional member tags list position [1] is not a string')
+
+    def test_validate_rest_unique(self):
+        item = self.item
+        item['tags'] = ['a', 'a']
+        lazy = validation.lazy(self.dicttype, item)
+        self.assertEqual(lazy['tags'][1], 'a')
+        self.assertRaises(validation.ValidationError, lazy.validate_rest)
+
+    def test_list_length(self):
+        item = self.item
+        item['tags'] = ['a', 'b', 'c', 'd']
+        lazy = validation.lazy(self.dicttype, item)
+        self.assertRaises(validation.ValidationError, lazy.__getitem__, 'tags')
+
+    def test_list_index(self):
+        lazy = validation.lazy(validation.List(validation.Int()), [1, 2])
+        self.assertRaises(IndexError, lazy.__getitem__, 2)
+        self.assertEqual(list(lazy), [1, 2])
+
+    def test_tuple_length(self):
+        item = self.item
+        item['location'] = (1.0,)
+        lazy = validation.lazy(self.dicttype, item)
+        self.assertRaises(validation.ValidationError, lazy.__getitem__, 'location')
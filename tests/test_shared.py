@@ -0,0 +1,99 @@
+__author__ = 'schlitzer'
+
+import array
+import concurrent.futures
+from multiprocessing import shared_memory
+from unittest import TestCase
+
+import validation
+from validation import shared
+
+
+class TestValidateArray(TestCase):
+    def setUp(self):
+        self.listtype = validation.List(validation.Int(minval=0, maxval=1000))
+
+    def assertSameError(self, validator, data, **kwargs):
+        with self.assertRaises(validation.ValidationError) as expected:
+            validator.validate(data.tolist())
+        with self.assertRaises(validation.ValidationError) as err:
+            shared.validate_array(validator, data, **kwargs)
+        self.assertEqual(str(err.exception), str(expected.exception))
+        return str(err.exception)
+
+    def test_valid(self):
+        data = array.array('q', range(1001))
+        self.assertIsNone(shared.validate_array(self.listtype, data, workers=2, chunksize=100))
+
+    def test_lowest_index(self):
+        data = array.array('q', range(1000))
+        data[900] = -1
+        data[512] = 1001
+        data[700] = -5
+        message = self.assertSameError(self.listtype, data, workers=3, chunksize=100)
+        self.assertTrue(message.startswith('list position [512]'))
+
+    def test_executor(self):
+        data = array.array('i', [5] * 1000)
+        data[250] = 2000
+        with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+            self.assertSameError(self.listtype, data, executor=executor, chunksize=100)
+
+    def test_in_process(self):
+        data = array.array('H', range(2000))
+        self.assertSameError(self.listtype, data, workers=1)
+        self.assertSameError(self.listtype, data, chunksize=10000)
+
+    def test_float(self):
+        listtype = validation.List(validation.Float(minval=0.0, maxval=1.0))
+        data = array.array('d', [0.5] * 1000)
+        self.assertIsNone(shared.validate_array(listtype, data, workers=2, chunksize=100))
+        data[100] = float('nan')
+        data[101] = -1.0
+        self.assertSameError(listtype, data, workers=2, chunksize=100)
+
+    def test_type(self):
+        self.assertSameError(self.listtype, array.array('d', [1.0, 2.0]))
+        self.assertSameError(validation.List(validation.Float()), array.array('b', [1, 2]))
+
+    def test_length(self):
+        listtype = validation.List(validation.Int(), max_items=10)
+        self.assertSameError(listtype, array.array('q', range(11)))
+
+    def test_unique(self):
+        listtype = validation.List(validation.Int(), unique=True)
+        self.assertSameError(listtype, array.array('q', [1, 2, 3, 2]))
+
+    def test_tuple(self):
+        tupletype = validation.Tuple()
+        tupletype.add_element(validation.Int(minval=0))
+        tupletype.add_element(validation.Int(maxval=10))
+        tupletype.add_element(validation.Float())
+        self.assertSameError(tupletype, array.array('q', [1, 2]))
+        self.assertSameError(tupletype, array.array('q', [1, 11, 3]), workers=2, chunksize=1)
+        self.assertSameError(tupletype, array.array('q', [1, 2, 3]), workers=2, chunksize=1)
+
+    def test_unsupported(self):
+        self.assertRaises(ValueError, shared.validate_array, validation.Int(), array.array('q', [1]))
+        self.assertRaises(ValueError, shared.validate_array, self.listtype, array.array('u', 'abc'))
+        self.assertRaises(ValueError, shared.validate_array, self.listtype, memoryview(b'abcd').cast('B', (2, 2)))
+
+
+class TestValidateShared(TestCase):
+    def test_validate(self):
+        listtype = validation.List(validation.Int(minval=0))
+        shm = shared_memory.SharedMemory(create=True, size=8 * 1000)
+        try:
+            with shm.buf.cast('q') as view:
+                for pos in range(1000):
+                    view[pos] = pos
+            self.assertIsNone(shared.validate_shared(listtype, shm, 'q', 1000, workers=2, chunksize=100))
+            with shm.buf.cast('q') as view:
+                view[999] = -1
+            with self.assertRaises(validation.ValidationError) as err:
+                shared.validate_shared(listtype, shm, 'q', 1000, workers=2, chunksize=100)
+            self.assertEqual(str(err.exception), 'list position [999] -1 is smaller then minimum value 0')
+            self.assertIsNone(shared.validate_shared(listtype, shm, 'q', 999, workers=2, chunksize=100))
+        finally:
+            shm.close()
+            shm.unlink()
@@ -0,0 +1,138 @@
+__author__ = 'schlitzer'
+
+import csv
+import io
+from unittest import TestCase
+
+import validation
+from validation import tabular
+
+CSV = """id,name,age,score,active,gender,ip,tags
+e7a5ff1c-ee5e-4ca9-a3d3-0106dd826dcd,John,42,1.5,true,male,127.0.0.1,"[""a"", ""b""]"
+e7a5ff1c-ee5e-4ca9-a3d3-0106dd826dcd,Paula,abc,2,false,female,::1,[]
+
+e7a5ff1c-ee5e-4ca9-a3d3-0106dd826dcd,Weirdo,200,x,maybe,all,256.0.0.1,[1]
+e7a5ff1c-ee5e-4ca9-a3d3-0106dd826dcd,Short
+"""
+
+
+class TabularTestCase(TestCase):
+    def setUp(self):
+        self.row = validation.Tuple()
+        self.row.add_element(validation.StringUUID())
+        self.row.add_element(validation.String(regex='^[A-Z]'))
+        self.row.add_element(validation.Int(minval=0, maxval=150))
+        self.row.add_element(validation.Float())
+        self.row.add_element(validation.Bool())
+        self.row.add_element(validation.Choice(choices=['male', 'female']))
+        self.row.add_element(validation.IP())
+        self.row.add_element(validation.List(validation.String()))
+
+
+class TestConverter(TestCase):
+    def test_converter(self):
+        self.assertEqual(tabular.converter(validation.Int())('42'), 42)
+        self.assertEqual(tabular.converter(validation.Int())('4.2'), '4.2')
+        self.assertEqual(tabular.converter(validation.Float())('4'), 4.0)
+        self.assertEqual(tabular.converter(validation.Float())('x'), 'x')
+        self.assertIs(tabular.converter(validation.Bool())('True'), True)
+        self.assertIs(tabular.converter(validation.Bool())('false'), False)
+        self.assertEqual(tabular.converter(validation.Bool())('1'), '1')
+        self.assertEqual(tabular.converter(validation.Choice(choices=[1, 2, 'a']))('2'), 2)
+        self.assertEqual(tabular.converter(validation.Choice(choices=[1, 2, 'a']))('a'), 'a')
+        self.assertEqual(tabular.converter(validation.Dict())('{"a": 1}'), {'a': 1})
+        self.assertEqual(tabular.converter(validation.Tuple())('[1'), '[1')
+        self.assertEqual(tabular.converter(validation.StringUUID())('42'), '42')
+
+    def test_converter_numbers(self):
+        for field in [' 10', '10 ', '1_0', ' 1_0 ', '']:
+            self.assertEqual(tabular.converter(validation.Int())(field), field)
+            self.assertEqual(tabular.converter(validation.Float())(field), field)
+        self.assertEqual(tabular.converter(validation.Int())('-10'), -10)
+        self.assertEqual(tabular.converter(validation.Float())('1e3'), 1000.0)
+        self.assertEqual(tabular.converter(validation.Float())('inf'), float('inf'))
+
+
+class TestIterErrors(TabularTestCase):
+    def test_errors(self):
+        errors = list(tabular.iter_errors(self.row, io.StringIO(CSV), header=True))
+        self.assertEqual([(row, column) for row, column, _ in errors], [
+            (1, 2), (2, 2), (2, 3), (2, 4), (2, 5), (2, 6), (2, 7), (3, None)
+        ])
+        self.assertEqual(errors[0][2], 'abc is not a integer')
+        self.assertEqual(errors[-1][2], 'unexpected length, expected 8 but is 2')
+
+    def test_tuple_errors(self):
+        schema = self.row
+        records = [
+            ['e7a5ff1c-ee5e-4ca9-a3d3-0106dd826dcd', 'Paula', 'abc', '2', 'false', 'female', '::1', '[]'],
+            ['e7a5ff1c-ee5e-4ca9-a3d3-0106dd826dcd', 'Paula', '20', '2', 'false', 'female', '::1', '[1]'],
+        ]
+        for record in records:
+            values = [tabular.converter(element)(field) for element, field in zip(schema.elements, record)]
+            with self.assertRaises(validation.ValidationError) as expected:
+                schema.validate(values)
+            data = io.StringIO()
+            csv.writer(data).writerow(record)
+            data.seek(0)
+            with self.assertRaises(validation.ValidationError) as err:
+                tabular.validate_file(schema, data)
+            self.assertEqual(str(err.exception), 'row [0] {0}'.format(expected.exception))
+
+    def test_tsv(self):
+        data = 'John\t1\nPaula\tx\n'
+        row = validation.Tuple()
+        row.add_element(validation.String())
+        row.add_element(validation.Int())
+        errors = list(tabular.iter_errors(row, io.StringIO(data), delimiter='\t'))
+        self.assertEqual(errors, [(1, 1, 'x is not a integer')])
+
+    def test_validator_exceptions(self):
+        tupletype = validation.Tuple()
+        tupletype.add_element(validation.IPv4Port())
+        tupletype.add_element(validation.Int())
+        errors = list(tabular.iter_errors(tupletype, io.StringIO('1.2.3.4,1\n1.2.3.4:abc,x\n1.2.3.4:80,2\n')))
+        self.assertEqual([(row, column) for row, column, _ in errors], [(0, 0), (1, 0), (1, 1)])
+        self.assertTrue(errors[0][2].startswith('ValueError: '))
+        self.assertEqual(errors[2][2], 'x is not a integer')
+
+    def test_no_tuple(self):
+        self.assertRaises(ValueError, list, tabular.iter_errors(validation.List(), io.StringIO('')))
+
+
+class TestIterBatches(TabularTestCase):
+    def test_batches(self):
+        batches = list(tabular.iter_batches(self.row, io.StringIO(CSV), chunksize=2, header=True))
+        self.assertEqual(len(batches), 2)
+        rows, errors = batches[0]
+        self.assertEqual([row for row, _ in rows], [0])
+        self.assertEqual(rows[0][1][2:5], [42, 1.5, True])
+        self.assertEqual(rows[0][1][7], ['a', 'b'])
+        self.assertEqual({row for row, _, _ in errors}, {1})
+        rows, errors = batches[1]
+        self.assertEqual(rows, [])
+        self.assertEqual({row for row, _, _ in errors}, {2, 3})
+
+    def test_stream(self):
+        def lines():
+            for pos in range(100000):
+                yield '{0}\n'.format(pos)
+
+        row = validation.Tuple()
+        row.add_element(validation.Int(minval=0))
+        batches = tabular.iter_batches(row, lines(), chunksize=1000)
+        self.assertEqual(sum(len(rows) for rows, _ in batches), 100000)
+
+
+class TestValidateFile(TabularTestCase):
+    def test_valid(self):
+        self.assertIsNone(tabular.validate_file(self.row, io.StringIO(CSV.split('\n')[1] + '\n')))
+
+    def test_invalid(self):
+        with self.assertRaises(validation.ValidationError) as err:
+            tabular.validate_file(self.row, io.StringIO(CSV), header=True)
+        self.assertEqual(str(err.exception), 'row [1] [2]abc is not a integer')
+        lines = CSV.split('\n')
+        with self.assertRaises(validation.ValidationError) as err:
+            tabular.validate_file(self.row, io.StringIO(lines[5]))
+        self.assertEqual(str(err.exception), 'row [0] unexpected length, expected 8 but is 2')
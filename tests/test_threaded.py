@@ -0,0 +1,80 @@
+__author__ = 'schlitzer'
+
+import concurrent.futures
+from unittest import TestCase
+from unittest.mock import patch
+
+import validation
+from validation import threaded
+
+
+class TestGilEnabled(TestCase):
+    def test_without_is_gil_enabled(self):
+        with patch.object(threaded, 'sys') as sys_mock:
+            del sys_mock._is_gil_enabled
+            self.assertTrue(threaded.gil_enabled())
+
+    def test_with_is_gil_enabled(self):
+        with patch.object(threaded, 'sys') as sys_mock:
+            sys_mock._is_gil_enabled.return_value = False
+            self.assertFalse(threaded.gil_enabled())
+
+
+class TestValidateBatch(TestCase):
+    def test_validate(self):
+        items = list(range(10000))
+        self.assertIsNone(threaded.validate_batch(validation.Int(), items, workers=4, chunksize=100, force=True))
+
+    def test_validate_earliest_error(self):
+        items = list(range(10000))
+        items[9000] = None
+        items[4321] = 'blarg'
+        items[5000] = None
+        with self.assertRaises(validation.ValidationError) as threaded_err:
+            threaded.validate_batch(validation.Int(), items, workers=4, chunksize=100, force=True)
+        with self.assertRaises(validation.ValidationError) as sequential_err:
+            validation.List(validation.Int()).validate(items)
+        self.assertEqual(str(threaded_err.exception), str(sequential_err.exception))
+        self.assertTrue(str(threaded_err.exception).startswith('list position [4321]'))
+
+    def test_validate_executor(self):
+        items = [True] * 1000 + [1]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            self.assertRaises(
+                validation.ValidationError, threaded.validate_batch,
+                validation.Bool(), items, chunksize=10, executor=executor, force=True
+            )
+
+    def test_validate_sequential_with_gil(self):
+        items = [True] * 1000
+        with patch.object(threaded, 'gil_enabled', return_value=True):
+            with patch.object(threaded, '_run_chunks') as run_chunks:
+                threaded.validate_batch(validation.Bool(), items, workers=4, chunksize=10)
+                self.assertFalse(run_chunks.called)
+
+
+class TestValidateList(TestCase):
+    def test_validate(self):
+        listtype = validation.List(validation.Bool())
+        self.assertIsNone(threaded.validate_list(listtype, [True] * 1000, workers=2, chunksize=10, force=True))
+        self.assertRaises(
+            validation.ValidationError, threaded.validate_list,
+            listtype, [True] * 1000 + [None], workers=2, chunksize=10, force=True
+        )
+
+    def test_validate_length(self):
+        listtype = validation.List(validation.Bool(), max_items=10)
+        self.assertRaises(
+            validation.ValidationError, threaded.validate_list,
+            listtype, [True] * 11, workers=2, chunksize=2, force=True
+        )
+
+    def test_validate_unique(self):
+        listtype = validation.List(validation.Int(), unique=True)
+        self.assertRaises(
+            validation.ValidationError, threaded.validate_list,
+            listtype, [1, 2, 3, 1], workers=2, chunksize=2, force=True
+        )
+
+    def test_validate_no_list(self):
+        self.assertRaises(ValueError, threaded.validate_list, validation.Bool(), [True])
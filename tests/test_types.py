@@ -1,5 +1,10 @@
 __author__ = 'schlitzer'
 
+import asyncio
+import concurrent.futures
+import datetime
+import os
+import time
 from unittest import TestCase
 from unittest.mock import Mock, patch
 
@@ -12,6 +17,323 @@ class TestBase(TestCase):
         self.assertRaises(NotImplementedError, base.validate, None)
 
 
+class TestBaseSingleton(TestCase):
+    def test_shared_instance(self):
+        self.assertIs(validation.Bool(), validation.Bool())
+        self.assertIs(validation.IP(), validation.IP())
+        self.assertIs(validation.IPPort(), validation.IPPort())
+        self.assertIs(validation.IPv4(), validation.IPv4())
+        self.assertIs(validation.IPv4Port(), validation.IPv4Port())
+        self.assertIs(validation.IPv6(), validation.IPv6())
+        self.assertIs(validation.IPv6Port(), validation.IPv6Port())
+        self.assertIs(validation.StringUUID(), validation.StringUUID())
+
+    def test_shared_instance_per_class(self):
+        self.assertIsNot(validation.IPv4(), validation.IPv6())
+        self.assertIsNot(validation.IPv4Port(), validation.IPv6Port())
+        self.assertIsNot(validation.IP(), validation.IPPort())
+
+
+class TestSlots(TestCase):
+    def test_no_instance_dict(self):
+        validators = [
+            validation.Bool(),
+            validation.Choice(choices=['yes', 'no']),
+            validation.Dict(),
+            validation.Float(),
+            validation.Int(),
+            validation.IP(),
+            validation.IPPort(),
+            validation.IPv4(),
+            validation.IPv4Port(),
+            validation.IPv6(),
+            validation.IPv6Port(),
+            validation.List(),
+            validation.String(),
+            validation.StringDate(),
+            validation.StringDateTime(),
+            validation.StringTime(),
+            validation.StringUUID(),
+            validation.Tuple(),
+        ]
+        for validator in validators:
+            self.assertFalse(hasattr(validator, '__dict__'), type(validator).__name__)
+
+
+class TestBaseValidateAt(TestCase):
+    def setUp(self):
+        item = validation.Dict()
+        item.required['price'] = validation.Float(minval=0.0)
+        item.optional['a/b'] = validation.Int()
+        location = validation.Tuple()
+        location.add_element(validation.Float())
+        location.add_element(validation.Float())
+        self.order = validation.Dict()
+        self.order.required['items'] = validation.List(item)
+        self.order.optional['location'] = location
+        self.order.optional['note'] = validation.String()
+        self.document = {
+            'items': [{'price': 1.0}, {'price': 2.0, 'a/b': 1}],
+            'location': (1.0, 2.0),
+        }
+
+    def test_validate_at(self):
+        self.assertIsNone(self.order.validate_at(self.document, '/items/1/price'))
+        self.assertIsNone(self.order.validate_at(self.document, '/items/1/a~1b'))
+        self.assertIsNone(self.order.validate_at(self.document, '/location/1'))
+        self.assertIsNone(self.order.validate_at(self.document, '/items/0'))
+        self.assertIsNone(self.order.validate_at(self.document, ''))
+
+    def test_validate_at_invalid(self):
+        self.document['items'][1]['price'] = -1.0
+        with self.assertRaises(validation.ValidationError) as err:
+            self.order.validate_at(self.document, '/items/1/price')
+        with self.assertRaises(validation.ValidationError) as full_err:
+            self.order.validate(self.document)
+        self.assertEqual(str(err.exception), str(full_err.exception))
+        self.assertIsNone(self.order.validate_at(self.document, '/items/0/price'))
+
+    def test_validate_at_tuple_invalid(self):
+        self.document['location'] = (1.0, 'blarg')
+        with self.assertRaises(validation.ValidationError) as err:
+            self.order.validate_at(self.document, '/location/1')
+        self.assertEqual(str(err.exception), 'optional member location [1]blarg is not a float')
+
+    def test_validate_at_missing(self):
+        self.assertIsNone(self.order.validate_at(self.document, '/note'))
+        self.assertIsNone(self.order.validate_at(self.document, '/items/5/price'))
+        del self.document['items'][0]['price']
+        self.assertRaises(validation.ValidationError, self.order.validate_at, self.document, '/items/0/price')
+
+    def test_validate_at_wrong_container(self):
+        self.document['items'] = {'blarg': 1}
+        self.assertRaises(validation.ValidationError, self.order.validate_at, self.document, '/items/0/price')
+        self.assertRaises(validation.ValidationError, self.order.validate_at, [], '/items')
+
+    def test_validate_at_unresolved(self):
+        self.assertRaises(ValueError, self.order.validate_at, self.document, 'items')
+        self.assertRaises(ValueError, self.order.validate_at, self.document, '/blarg')
+        self.assertRaises(ValueError, self.order.validate_at, self.document, '/items/first')
+        self.assertRaises(ValueError, self.order.validate_at, self.document, '/location/2')
+        self.assertRaises(ValueError, self.order.validate_at, self.document, '/note/0')
+
+    def test_validate_at_frozen(self):
+        self.order.freeze()
+        self.assertIsNone(self.order.validate_at(self.document, '/items/1/price'))
+        self.document['items'][1]['price'] = 'blarg'
+        self.assertRaises(validation.ValidationError, self.order.validate_at, self.document, '/items/1/price')
+        self.assertEqual(list(self.order._paths), ['/items/1/price'])
+
+    def test_validate_at_frozen_leaf(self):
+        self.assertIsNone(validation.String().freeze().validate_at('x', ''))
+        self.assertRaises(validation.ValidationError, validation.String().freeze().validate_at, 1, '')
+        self.assertIsNone(validation.Int().freeze().validate_at(1, ''))
+        self.assertRaises(ValueError, validation.String().freeze().validate_at, 'x', '/a')
+
+    def test_validate_at_cache_size(self):
+        self.order.freeze()
+        with patch.object(validation, 'PATH_CACHE_SIZE', 2):
+            for path in ('/items/0/price', '/items/1/price', '/items/2/price'):
+                self.order.validate_at(self.document, path)
+        self.assertEqual(list(self.order._paths), ['/items/2/price'])
+
+
+class TestDeadline(TestCase):
+    def setUp(self):
+        self.dicttype = validation.Dict()
+        self.dicttype.required['name'] = validation.String()
+        self.dicttype.required['rows'] = validation.List(validation.List(validation.Int()))
+        self.item = {'name': 'blarg', 'rows': [list(range(100)) for _ in range(100)]}
+
+    def test_validate_in_time(self):
+        self.assertIsNone(self.dicttype.validate(self.item, deadline=time.monotonic() + 60))
+
+    def test_validate_timeout(self):
+        with self.assertRaises(validation.ValidationTimeout) as err:
+            self.dicttype.validate(self.item, deadline=time.monotonic() - 1)
+        self.assertEqual(str(err.exception), 'required member name deadline exceeded')
+
+    def test_validate_timeout_path(self):
+        clock = Mock(side_effect=[0, 0, 10])
+        with patch('validation.time.monotonic', clock):
+            with self.assertRaises(validation.ValidationTimeout) as err:
+                self.dicttype.validate(self.item, deadline=5)
+        self.assertTrue(str(err.exception).startswith('required member rows list position ['))
+        self.assertTrue(str(err.exception).endswith('deadline exceeded'))
+        self.assertIsInstance(err.exception, validation.ValidationError)
+
+    def test_validate_list_timeout(self):
+        listtype = validation.List(validation.Int())
+        self.assertRaises(validation.ValidationTimeout, listtype.validate, [1, 2], deadline=time.monotonic() - 1)
+
+    def test_validate_tuple_timeout(self):
+        tupletype = validation.Tuple()
+        tupletype.add_element(validation.Int())
+        self.assertRaises(validation.ValidationTimeout, tupletype.validate, [1], deadline=time.monotonic() - 1)
+
+    def test_deadline_reset(self):
+        self.assertRaises(
+            validation.ValidationTimeout, self.dicttype.validate, self.item, deadline=time.monotonic() - 1
+        )
+        self.assertIsNone(self.dicttype.validate(self.item))
+
+    def test_invalid_before_deadline(self):
+        self.item['rows'][3][4] = None
+        with self.assertRaises(validation.ValidationError) as err:
+            self.dicttype.validate(self.item, deadline=time.monotonic() + 60)
+        self.assertNotIsInstance(err.exception, validation.ValidationTimeout)
+
+
+class TestMemo(TestCase):
+    def setUp(self):
+        self.city = Mock()
+        address = validation.Dict()
+        address.required['city'] = self.city
+        self.listtype = validation.List(address)
+
+    def test_identity(self):
+        address = {'city': 'Berlin'}
+        items = [address] * 100
+        self.assertIsNone(self.listtype.validate(items, memo=True))
+        self.assertEqual(self.city.validate.call_count, 1)
+
+    def test_identity_per_call(self):
+        address = {'city': 'Berlin'}
+        self.listtype.validate([address] * 10, memo=True)
+        self.listtype.validate([address] * 10, memo=True)
+        self.assertEqual(self.city.validate.call_count, 2)
+
+    def test_identity_equal_copies(self):
+        self.listtype.validate([{'city': 'Berlin'} for _ in range(10)], memo=True)
+        self.assertEqual(self.city.validate.call_count, 10)
+
+    def test_without_memo(self):
+        address = {'city': 'Berlin'}
+        self.listtype.validate([address] * 10)
+        self.assertEqual(self.city.validate.call_count, 10)
+
+    def test_invalid(self):
+        listtype = validation.List(validation.List(validation.Int()))
+        self.assertRaises(validation.ValidationError, listtype.validate, [[1], [1, None]], memo=True)
+
+    def test_content(self):
+        element = validation.Tuple()
+        element.add_element(validation.StringUUID())
+        element.add_element(validation.Int())
+        listtype = validation.List(element).freeze()
+        row = ('e7a5ff1c-ee5e-4ca9-a3d3-0106dd826dcd', 1)
+        self.assertIsNone(listtype.validate([row], memo='content'))
+        with patch.object(validation.Tuple, '_validate') as tuple_validate:
+            self.assertIsNone(listtype.validate([tuple(row)], memo='content'))
+            self.assertFalse(tuple_validate.called)
+
+    def test_content_types(self):
+        element = validation.Tuple()
+        element.add_element(validation.Int())
+        listtype = validation.List(element).freeze()
+        self.assertIsNone(listtype.validate([(1,)], memo='content'))
+        self.assertRaises(validation.ValidationError, listtype.validate, [(True,)], memo='content')
+        self.assertRaises(validation.ValidationError, listtype.validate, [(1.0,)], memo='content')
+
+    def test_content_not_frozen(self):
+        element = validation.Tuple()
+        element.add_element(validation.Int())
+        listtype = validation.List(element)
+        self.assertIsNone(listtype.validate([(1,)], memo='content'))
+        self.assertIsNone(element._content)
+
+    def test_content_size(self):
+        element = validation.Tuple()
+        element.add_element(validation.Int())
+        listtype = validation.List(element).freeze()
+        with patch.object(validation, 'CONTENT_MEMO_SIZE', 10):
+            listtype.validate([(pos,) for pos in range(25)], memo='content')
+        self.assertLessEqual(len(element._content), 10)
+
+
+class TestValidateAsync(TestCase):
+    def setUp(self):
+        address = validation.Dict(ignore_unknown=False)
+        address.required['city'] = validation.String()
+        address.optional['zip'] = validation.Int()
+        location = validation.Tuple()
+        location.add_element(validation.Float())
+        location.add_element(validation.Float())
+        self.schema = validation.Dict()
+        self.schema.required['addresses'] = validation.List(address, max_items=100)
+        self.schema.optional['location'] = location
+        self.schema.optional['tags'] = validation.List(validation.Int(), unique=True)
+
+    def assertSameError(self, validator, item, **kwargs):
+        with self.assertRaises(validation.ValidationError) as expected:
+            validator.validate(item)
+        with self.assertRaises(validation.ValidationError) as err:
+            asyncio.run(validator.validate_async(item, **kwargs))
+        self.assertEqual(str(err.exception), str(expected.exception))
+
+    def test_valid(self):
+        item = {'addresses': [{'city': 'Berlin', 'zip': 10115}] * 50, 'location': [52.5, 13.4], 'tags': [1, 2]}
+        self.assertIsNone(asyncio.run(self.schema.validate_async(item)))
+
+    def test_leaf(self):
+        self.assertIsNone(asyncio.run(validation.Int().validate_async(1)))
+        self.assertRaises(validation.ValidationError, asyncio.run, validation.Int().validate_async('1'))
+
+    def test_errors(self):
+        self.assertSameError(self.schema, [])
+        self.assertSameError(self.schema, {})
+        self.assertSameError(self.schema, {'addresses': [{'city': 'Berlin'}, {'city': 1}]})
+        self.assertSameError(self.schema, {'addresses': [{'city': 'Berlin', 'street': 'x'}]})
+        self.assertSameError(self.schema, {'addresses': [{'city': 'Berlin'}] * 101})
+        self.assertSameError(self.schema, {'addresses': [], 'location': [1.0]})
+        self.assertSameError(self.schema, {'addresses': [], 'location': [1.0, 1]})
+        self.assertSameError(self.schema, {'addresses': [], 'tags': [1, 2, 1]})
+
+    def test_iterable(self):
+        listtype = validation.List(validation.Int(), max_items=3)
+        self.assertIsNone(asyncio.run(listtype.validate_async(iter([1, 2]))))
+        with self.assertRaises(validation.ValidationError) as err:
+            asyncio.run(listtype.validate_async(iter(range(10))))
+        self.assertEqual(str(err.exception), 'list has more then 3 items')
+
+    def test_yields(self):
+        listtype = validation.List(validation.List(validation.Int()))
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(None)
+                await asyncio.sleep(0)
+
+        async def run():
+            task = asyncio.ensure_future(ticker())
+            await asyncio.sleep(0)
+            ticks.clear()
+            await listtype.validate_async([[1] * 10] * 100, interval=100, budget=None)
+            task.cancel()
+
+        asyncio.run(run())
+        self.assertGreaterEqual(len(ticks), 10)
+
+    def test_budget(self):
+        state = validation._AsyncPass(None, 0, None, None)
+        self.assertFalse(state.tick())
+        for _ in range(state.CLOCK - 2):
+            state.tick()
+        self.assertTrue(state.tick())
+
+    def test_offload(self):
+        listtype = validation.List(validation.Int(maxval=10), unique=True)
+        with concurrent.futures.ThreadPoolExecutor(1) as executor:
+            self.assertIsNone(asyncio.run(listtype.validate_async(list(range(10)), executor=executor, offload_size=3)))
+            self.assertSameError(listtype, [1, 2, 3, 4, 11], executor=executor, offload_size=2)
+            self.assertSameError(listtype, [1, 2, 3, 1, 11], executor=executor, offload_size=2)
+        self.assertSameError(listtype, [1, 2, 3, 4, 11], offload_size=2)
+
+    def test_offload_size(self):
+        self.assertRaises(ValueError, asyncio.run, self.schema.validate_async({}, offload_size=0))
+
+
 class TestBaseNumber(TestCase):
     def test___init__(self):
         basenumber = validation.BaseNumber(int, 'integer', 0, 100)
@@ -73,6 +395,25 @@ class TestChoice(TestCase):
         choicetype = validation.Choice(choices=['yes', 'no'])
         self.assertRaises(validation.ValidationError, choicetype.validate, 'blarg')
 
+    def test_freeze(self):
+        choicetype = validation.Choice(choices=['yes', 'no']).freeze()
+        self.assertIsNone(choicetype.validate('no'))
+        self.assertRaises(validation.ValidationError, choicetype.validate, 'blarg')
+        self.assertRaises(validation.ValidationError, choicetype.validate, ['yes'])
+
+    def test_freeze_unhashable_choices(self):
+        choicetype = validation.Choice(choices=[['yes'], ['no']]).freeze()
+        self.assertIsNone(choicetype.validate(['no']))
+        self.assertRaises(validation.ValidationError, choicetype.validate, 'no')
+
+    def test_freeze_copies_choices(self):
+        choices = ['yes', 'no']
+        choicetype = validation.Choice(choices=choices).freeze()
+        choices.append('maybe')
+        with self.assertRaises(validation.ValidationError) as err:
+            choicetype.validate('maybe')
+        self.assertEqual(str(err.exception), "should be any of ('yes', 'no') actually is: maybe")
+
 
 class TestDict(TestCase):
     def test___init__(self):
@@ -158,6 +499,288 @@ class TestDict(TestCase):
         dicttype = validation.Dict(ignore_unknown=False)
         self.assertRaises(validation.ValidationError, dicttype.validate, candidate)
 
+    def test_freeze(self):
+        dicttype = validation.Dict(ignore_unknown=False)
+        dicttype.required['attr1'] = validation.Bool()
+        dicttype.optional['attr2'] = validation.List(validation.Int())
+        self.assertIs(dicttype.freeze(), dicttype)
+
+        self.assertIsNone(dicttype.validate({'attr1': True, 'attr2': [1, 2]}))
+        self.assertRaises(validation.ValidationError, dicttype.validate, {'attr1': True, 'attr2': [1, None]})
+        self.assertRaises(validation.ValidationError, dicttype.validate, {'attr2': [1]})
+        self.assertRaises(validation.ValidationError, dicttype.validate, {'attr1': True, 'attr3': 1})
+
+    def test_freeze_rejects_mutation(self):
+        dicttype = validation.Dict()
+        dicttype.required['attr1'] = validation.List(validation.Int())
+        dicttype.freeze()
+
+        with self.assertRaises(TypeError):
+            dicttype.required['attr2'] = validation.Bool()
+        with self.assertRaises(TypeError):
+            dicttype.optional['attr2'] = validation.Bool()
+        with self.assertRaises(TypeError):
+            dicttype.required['attr1'].validator = validation.Bool()
+
+    def test_freeze_recursive(self):
+        dicttype = validation.Dict()
+        dicttype.optional['children'] = validation.List(dicttype)
+        dicttype.freeze()
+
+        self.assertIsNone(dicttype.validate({'children': [{'children': []}]}))
+        self.assertRaises(validation.ValidationError, dicttype.validate, {'children': [{'children': [1]}]})
+
+
+class TestDictAdaptive(TestCase):
+    def setUp(self):
+        self.dicttype = validation.Dict(ignore_unknown=False, adaptive=True)
+        self.dicttype.required['_id'] = validation.StringUUID()
+        self.dicttype.required['name'] = validation.String(regex='^[A-Z][a-z]+$')
+        self.dicttype.required['type'] = validation.Choice(choices=['user', 'group'])
+        self.dicttype.optional['age'] = validation.Int(minval=0)
+        self.valid = {'_id': 'e7a5ff1c-ee5e-4ca9-a3d3-0106dd826dcd', 'name': 'John', 'type': 'user'}
+
+    def test_validate(self):
+        self.assertIsNone(self.dicttype.validate(self.valid))
+        self.assertRaises(validation.ValidationError, self.dicttype.validate, dict(self.valid, blarg=1))
+        self.assertRaises(validation.ValidationError, self.dicttype.validate, dict(self.valid, age=-1))
+
+    def test_reorder(self):
+        invalid = dict(self.valid, type='blarg', age=30)
+        for _ in range(validation._AdaptiveOrder.REORDER):
+            self.assertRaises(validation.ValidationError, self.dicttype.validate, invalid)
+        self.assertEqual(self.dicttype._adaptive.order[0], 'type')
+
+    def test_reorder_later_members(self):
+        def slow(value):
+            time.sleep(0.0005)
+            raise validation.ValidationError('is slow')
+
+        dicttype = validation.Dict(adaptive=True)
+        dicttype.required['a'] = Mock(validate=Mock(side_effect=slow))
+        dicttype.required['b'] = validation.Choice(choices=['user', 'group'])
+        with patch.object(validation._AdaptiveOrder, 'REORDER', 64), patch.object(validation._AdaptiveOrder, 'SAMPLE', 4):
+            for _ in range(64):
+                self.assertRaises(validation.ValidationError, dicttype.validate, {'a': 'x', 'b': 'x'})
+        self.assertEqual(dicttype._adaptive._failures, [64, 16])
+        self.assertEqual(dicttype._adaptive.order, ['b', 'a'])
+
+    def test_deterministic_error(self):
+        declared = validation.Dict(ignore_unknown=False)
+        declared.required.update(self.dicttype.required)
+        declared.optional.update(self.dicttype.optional)
+        invalid = dict(self.valid, type='blarg')
+        for _ in range(validation._AdaptiveOrder.REORDER):
+            self.assertRaises(validation.ValidationError, self.dicttype.validate, invalid)
+        both_invalid = dict(self.valid, name='blarg', type='blarg')
+        with self.assertRaises(validation.ValidationError) as err:
+            self.dicttype.validate(both_invalid)
+        with self.assertRaises(validation.ValidationError) as declared_err:
+            declared.validate(both_invalid)
+        self.assertEqual(str(err.exception), str(declared_err.exception))
+        self.assertTrue(str(err.exception).startswith('required member name'))
+
+    def test_members_changed(self):
+        self.assertIsNone(self.dicttype.validate(self.valid))
+        self.dicttype.required['active'] = validation.Bool()
+        self.assertRaises(validation.ValidationError, self.dicttype.validate, self.valid)
+
+    def test_frozen(self):
+        self.dicttype.freeze()
+        self.assertIsNone(self.dicttype.validate(self.valid))
+        self.assertRaises(validation.ValidationError, self.dicttype.validate, dict(self.valid, type='blarg'))
+
+
+class TestDictPatterns(TestCase):
+    def setUp(self):
+        self.dicttype = validation.Dict(ignore_unknown=False)
+        self.dicttype.required['name'] = validation.String()
+        self.dicttype.optional['x-id'] = validation.Int()
+        self.dicttype.patterns['x-'] = validation.String()
+        self.dicttype.patterns[r'metric\.[a-z]+$'] = validation.Float()
+        self.dicttype.patterns['(de|en|fr)(_[A-Z]{2})?$'] = validation.String(regex='^.+$')
+
+    def test_patterns(self):
+        self.assertEqual(list(validation.Dict().patterns), [])
+        self.assertEqual(len(self.dicttype.patterns), 3)
+
+    def test_valid(self):
+        item = {'name': 'John', 'x-id': 1, 'x-trace': 'abc', 'metric.load': 1.5, 'de': 'Hallo', 'en_GB': 'Hello'}
+        self.assertIsNone(self.dicttype.validate(item))
+        self.assertIsNone(self.dicttype.freeze().validate(item))
+
+    def test_invalid(self):
+        for frozen in (False, True):
+            if frozen:
+                self.dicttype.freeze()
+            with self.assertRaises(validation.ValidationError) as err:
+                self.dicttype.validate({'name': 'John', 'metric.load': 'high'})
+            self.assertEqual(str(err.exception), 'pattern member metric.load high is not a float')
+            with self.assertRaises(validation.ValidationError) as err:
+                self.dicttype.validate({'name': 'John', 'metric.Load': 1.0})
+            self.assertEqual(str(err.exception), "got unknown members: {'metric.Load'}")
+            with self.assertRaises(validation.ValidationError) as err:
+                self.dicttype.validate({'name': 'John', 'x-id': 'a'})
+            self.assertEqual(str(err.exception), 'optional member x-id a is not a integer')
+
+    def test_first_pattern(self):
+        dicttype = validation.Dict()
+        dicttype.patterns['a'] = validation.Int()
+        dicttype.patterns['ab'] = validation.String()
+        self.assertIsNone(dicttype.validate({'abc': 1}))
+        self.assertIs(dicttype.pattern_validator('abc'), dicttype.patterns['a'])
+        self.assertIsNone(dicttype.pattern_validator('b'))
+        self.assertIsNone(dicttype.pattern_validator(1))
+
+    def test_ignore_unknown(self):
+        dicttype = validation.Dict()
+        dicttype.patterns['x-'] = validation.Int()
+        self.assertIsNone(dicttype.validate({'y': 'a', 1: 'b', 'x-a': 1}))
+        self.assertRaises(validation.ValidationError, dicttype.validate, {'y': 'a', 'x-a': 'b'})
+
+    def test_groups(self):
+        dicttype = validation.Dict()
+        dicttype.patterns['(?P<lang>[a-z]{2})(-[a-z]+)?$'] = validation.Int()
+        dicttype.patterns['(x)'] = validation.String()
+        self.assertIsNone(dicttype.validate({'de-at': 1, 'xyz': 'a'}))
+        self.assertRaises(validation.ValidationError, dicttype.validate, {'de-at': 'a'})
+        self.assertRaises(validation.ValidationError, dicttype.validate, {'xyz': 1})
+
+    def test_invalid_patterns(self):
+        dicttype = validation.Dict()
+        dicttype.patterns['(?i)x-'] = validation.Int()
+        dicttype.patterns['y-'] = validation.Int()
+        self.assertRaises(ValueError, dicttype.validate, {})
+        self.assertRaises(ValueError, dicttype.freeze)
+
+    def test_frozen(self):
+        self.dicttype.freeze()
+        with self.assertRaises(TypeError):
+            self.dicttype.patterns['y-'] = validation.Int()
+
+    def test_combined_once(self):
+        item = {'name': 'John', 'x-trace': 'abc'}
+        with patch.object(validation, '_combine_patterns', wraps=validation._combine_patterns) as combine:
+            self.dicttype.validate(item)
+            self.dicttype.validate(item)
+            self.assertIs(self.dicttype.pattern_validator('x-trace'), self.dicttype.patterns['x-'])
+            self.assertEqual(combine.call_count, 1)
+            self.dicttype.patterns['x-'] = validation.Int()
+            self.assertRaises(validation.ValidationError, self.dicttype.validate, item)
+            self.assertEqual(combine.call_count, 2)
+
+    def test_adaptive(self):
+        dicttype = validation.Dict(ignore_unknown=False, adaptive=True)
+        dicttype.required['name'] = validation.String()
+        dicttype.patterns['x-'] = validation.Int()
+        for _ in range(3):
+            self.assertIsNone(dicttype.validate({'name': 'John', 'x-a': 1}))
+            self.assertRaises(validation.ValidationError, dicttype.validate, {'name': 'John', 'x-a': 'b'})
+            self.assertRaises(validation.ValidationError, dicttype.validate, {'name': 'John', 'y': 1})
+
+    def test_validate_async(self):
+        for item in [{'name': 'John', 'metric.load': 'high'}, {'name': 'John', 'y': 1}]:
+            with self.assertRaises(validation.ValidationError) as expected:
+                self.dicttype.validate(item)
+            with self.assertRaises(validation.ValidationError) as err:
+                asyncio.run(self.dicttype.validate_async(item))
+            self.assertEqual(str(err.exception), str(expected.exception))
+        self.assertIsNone(asyncio.run(self.dicttype.validate_async({'name': 'John', 'x-a': 'b'})))
+
+    def test_validate_patch(self):
+        original = {'name': 'John', 'x-a': 'b'}
+        self.assertIsNone(self.dicttype.validate_patch(original, {'x-b': 'c', 'x-a': None}))
+        with self.assertRaises(validation.ValidationError) as err:
+            self.dicttype.validate_patch(original, {'x-b': 1})
+        self.assertEqual(str(err.exception), 'pattern member x-b is not a string')
+        self.assertRaises(validation.ValidationError, self.dicttype.validate_patch, original, {'y': 1})
+
+    def test_validate_at(self):
+        item = {'name': 'John', 'metric.load': 'high'}
+        with self.assertRaises(validation.ValidationError) as err:
+            self.dicttype.validate_at(item, '/metric.load')
+        self.assertEqual(str(err.exception), 'pattern member metric.load high is not a float')
+        self.assertIsNone(self.dicttype.validate_at(item, '/metric.free'))
+        self.assertRaises(ValueError, self.dicttype.validate_at, item, '/y')
+
+
+class TestDictValidatePatch(TestCase):
+    def setUp(self):
+        address = validation.Dict(ignore_unknown=False)
+        address.required['city'] = validation.String()
+        address.optional['zip'] = validation.Int()
+        self.dicttype = validation.Dict(ignore_unknown=False)
+        self.dicttype.required['name'] = validation.String()
+        self.dicttype.required['address'] = address
+        self.dicttype.optional['age'] = validation.Int(minval=0)
+        self.dicttype.optional['tags'] = validation.List(validation.String())
+        self.dicttype.optional['extra'] = validation.Dict()
+        self.original = {'name': 'John', 'address': {'city': 'Berlin', 'zip': 10115}, 'age': 42}
+
+    def assertSameResult(self, patch):
+        try:
+            self.dicttype.validate(validation.merge_patch(self.original, patch))
+            expected = None
+        except validation.ValidationError as err:
+            expected = err
+        if expected is None:
+            self.assertIsNone(self.dicttype.validate_patch(self.original, patch))
+        else:
+            self.assertRaises(validation.ValidationError, self.dicttype.validate_patch, self.original, patch)
+
+    def test_validate_patch(self):
+        patches = [
+            {},
+            {'name': 'Paula'},
+            {'name': 42},
+            {'name': None},
+            {'age': None},
+            {'age': -1},
+            {'blarg': 1},
+            {'blarg': None},
+            {'address': {'zip': None}},
+            {'address': {'zip': 'blarg'}},
+            {'address': {'city': None}},
+            {'address': {'street': 'Main'}},
+            {'address': 'Berlin'},
+            {'address': {'city': 'Hamburg', 'zip': 20095}},
+            {'tags': ['a', 'b']},
+            {'tags': ['a', 1]},
+            {'extra': {'a': {'b': None}}},
+            {'extra': {'a': None}},
+        ]
+        for patch in patches:
+            self.assertSameResult(patch)
+
+    def test_validate_patch_untouched_members(self):
+        validator = Mock()
+        self.dicttype.required['name'] = validator
+        self.dicttype.validate_patch(self.original, {'age': 43})
+        self.assertFalse(validator.validate.called)
+        self.assertFalse(validator.validate_patch.called)
+
+    def test_validate_patch_error_path(self):
+        with self.assertRaises(validation.ValidationError) as err:
+            self.dicttype.validate_patch(self.original, {'address': {'zip': 'blarg'}})
+        self.assertEqual(str(err.exception), 'required member address optional member zip blarg is not a integer')
+
+    def test_validate_patch_replace(self):
+        self.assertRaises(validation.ValidationError, self.dicttype.validate_patch, self.original, ['blarg'])
+
+
+class TestMergePatch(TestCase):
+    def test_merge_patch(self):
+        target = {'a': 1, 'b': {'c': 2, 'd': 3}}
+        self.assertEqual(
+            validation.merge_patch(target, {'a': None, 'b': {'c': None, 'e': 4}, 'f': [1]}),
+            {'b': {'d': 3, 'e': 4}, 'f': [1]}
+        )
+        self.assertEqual(target, {'a': 1, 'b': {'c': 2, 'd': 3}})
+
+    def test_merge_patch_no_dict(self):
+        self.assertEqual(validation.merge_patch({'a': 1}, [1]), [1])
+        self.assertEqual(validation.merge_patch([1], {'a': 1, 'b': None}), {'a': 1})
+
 
 class TestFloat(TestCase):
     def test___init__(self):
@@ -307,6 +930,239 @@ class TestList(TestCase):
         listtype.validator = validation.Bool()
         self.assertRaises(validation.ValidationError, listtype.validate, [True, False, None])
 
+    def test_validate_not_a_list(self):
+        listtype = validation.List(validation.String())
+        sampled = validation.List(validation.String(), sample=1, sample_edges=0)
+        for item in [{'a': 1}, {'a'}, frozenset('a'), 'abc', b'abc']:
+            for validator in (listtype, sampled):
+                with self.assertRaises(validation.ValidationError) as err:
+                    validator.validate(item)
+                self.assertEqual(str(err.exception), 'is not a list')
+                self.assertRaises(validation.ValidationError, asyncio.run, validator.validate_async(item))
+            self.assertRaises(validation.ValidationError, list, listtype.iter_validate(item))
+            self.assertRaises(validation.ValidationError, sampled.validate_sample, item)
+        dicttype = validation.Dict()
+        dicttype.required['tags'] = listtype
+        with self.assertRaises(validation.ValidationError) as err:
+            dicttype.validate({'tags': {'x': 1}})
+        self.assertEqual(str(err.exception), 'required member tags is not a list')
+
+    def test_validate_generator(self):
+        listtype = validation.List(validation.Int())
+        self.assertIsNone(listtype.validate(pos for pos in range(10)))
+        self.assertRaises(validation.ValidationError, listtype.validate, iter([1, 2, None]))
+
+    def test_validate_error_position(self):
+        listtype = validation.List(validation.Int())
+        with self.assertRaises(validation.ValidationError) as err:
+            listtype.validate(iter([1, 2, None]))
+        self.assertEqual(str(err.exception), 'list position [2] None is not a integer')
+
+    def test___init__length_wrong_type(self):
+        self.assertRaises(ValueError, validation.List, validation.Int(), min_items=1.0)
+        self.assertRaises(ValueError, validation.List, validation.Int(), max_items='1')
+
+    def test___init__min_bigger_then_max(self):
+        self.assertRaises(ValueError, validation.List, validation.Int(), min_items=2, max_items=1)
+
+    def test_validate_min_items(self):
+        listtype = validation.List(validation.Int(), min_items=2)
+        self.assertIsNone(listtype.validate([1, 2]))
+        self.assertRaises(validation.ValidationError, listtype.validate, [1])
+        self.assertRaises(validation.ValidationError, listtype.validate, iter([1]))
+
+    def test_validate_max_items(self):
+        listtype = validation.List(validation.Int(), max_items=2)
+        self.assertIsNone(listtype.validate([1, 2]))
+        self.assertIsNone(listtype.validate(iter([1, 2])))
+        self.assertRaises(validation.ValidationError, listtype.validate, [1, 2, 3])
+        self.assertRaises(validation.ValidationError, listtype.validate, iter([1, 2, 3]))
+
+    def test_validate_max_items_before_members(self):
+        validator = Mock()
+        listtype = validation.List(validator, max_items=2)
+        self.assertRaises(validation.ValidationError, listtype.validate, [1, 2, 3])
+        self.assertFalse(validator.validate.called)
+
+    def test_validate_max_items_stops_iteration(self):
+        consumed = []
+
+        def members():
+            for pos in range(1000):
+                consumed.append(pos)
+                yield pos
+
+        listtype = validation.List(validation.Int(), max_items=2)
+        self.assertRaises(validation.ValidationError, listtype.validate, members())
+        self.assertEqual(len(consumed), 3)
+
+    def test_validate_unique(self):
+        listtype = validation.List(validation.Int(), unique=True)
+        self.assertIsNone(listtype.validate([1, 2, 3]))
+        with self.assertRaises(validation.ValidationError) as err:
+            listtype.validate([1, 2, 3, 2])
+        self.assertEqual(str(err.exception), 'list position [3] duplicate of position [1]')
+
+    def test_validate_unique_types(self):
+        listtype = validation.List(Mock(), unique=True)
+        self.assertIsNone(listtype.validate([1, True, 1.0, 0, False, 0.0]))
+        self.assertIsNone(listtype.validate([(1,), (True,), [1], [True], {'a': 1}, {'a': True}, {1}, {True}]))
+        with self.assertRaises(validation.ValidationError) as err:
+            listtype.validate([1, True, [1.0], [1.0]])
+        self.assertEqual(str(err.exception), 'list position [3] duplicate of position [2]')
+
+    def test_validate_unique_unhashable(self):
+        listtype = validation.List(validation.Dict(), unique=True)
+        self.assertIsNone(listtype.validate([{'a': [1]}, {'a': [2]}]))
+        self.assertRaises(validation.ValidationError, listtype.validate, [{'a': [1]}, {'a': [1]}])
+
+    def test_validate_unique_fallback(self):
+        class Unhashable(object):
+            __hash__ = None
+
+            def __init__(self, value):
+                self.value = value
+
+            def __eq__(self, other):
+                return self.value == other.value
+
+        validator = Mock()
+        listtype = validation.List(validator, unique=True)
+        self.assertIsNone(listtype.validate([Unhashable(1), Unhashable(2)]))
+        self.assertRaises(validation.ValidationError, listtype.validate, [Unhashable(1), Unhashable(1)])
+
+    def test_iter_validate(self):
+        listtype = validation.List(validation.Int())
+        self.assertEqual(list(listtype.iter_validate(pos for pos in range(3))), [0, 1, 2])
+
+    def test_iter_validate_invalid(self):
+        listtype = validation.List(validation.Int())
+        validated = listtype.iter_validate(iter([1, None, 3]))
+        self.assertEqual(next(validated), 1)
+        self.assertRaises(validation.ValidationError, next, validated)
+
+    def test_freeze(self):
+        listtype = validation.List(validation.Bool()).freeze()
+        self.assertIsNone(listtype.validate([True, False]))
+        with self.assertRaises(TypeError):
+            listtype.validator = validation.Int()
+
+
+class TestListSampling(TestCase):
+    def setUp(self):
+        self.listtype = validation.List(validation.Int(), sample=10, sample_edges=5, sample_seed=1)
+
+    def test_properties(self):
+        self.assertEqual(self.listtype.sample, 10)
+        self.assertEqual(self.listtype.sample_edges, 5)
+        self.assertEqual(self.listtype.sample_seed, 1)
+        self.assertIsNone(validation.List().sample)
+
+    def test_sampled_positions(self):
+        positions = self.listtype.sampled_positions(1000)
+        self.assertEqual(len(positions), 20)
+        self.assertEqual(positions[:5], [0, 1, 2, 3, 4])
+        self.assertEqual(positions[-5:], [995, 996, 997, 998, 999])
+        self.assertEqual(positions, sorted(set(positions)))
+        self.assertEqual(positions, self.listtype.sampled_positions(1000))
+        other = validation.List(validation.Int(), sample=10, sample_edges=5, sample_seed=2)
+        self.assertNotEqual(positions, other.sampled_positions(1000))
+
+    def test_sampled_positions_small(self):
+        self.assertEqual(self.listtype.sampled_positions(0), [])
+        self.assertEqual(self.listtype.sampled_positions(8), list(range(8)))
+        self.assertEqual(self.listtype.sampled_positions(20), list(range(20)))
+        self.assertEqual(validation.List().sampled_positions(3), [0, 1, 2])
+
+    def test_sampled_positions_fraction(self):
+        listtype = validation.List(validation.Int(), sample=0.1, sample_edges=0)
+        self.assertEqual(len(listtype.sampled_positions(1000)), 100)
+        self.assertEqual(len(listtype.sampled_positions(5)), 1)
+        self.assertEqual(validation.List(sample=1.0).sampled_positions(100), list(range(100)))
+
+    def test_validate(self):
+        items = list(range(1000))
+        positions = set(self.listtype.sampled_positions(1000))
+        unchecked = min(set(range(1000)) - positions)
+        items[unchecked] = 'blarg'
+        self.assertIsNone(self.listtype.validate(items))
+        checked = sorted(positions)[7]
+        items[checked] = 'blarg'
+        with self.assertRaises(validation.ValidationError) as err:
+            self.listtype.validate(items)
+        self.assertEqual(str(err.exception), 'list position [{0}] blarg is not a integer'.format(checked))
+        self.assertRaises(validation.ValidationError, self.listtype.validate, items[:-1] + [None])
+
+    def test_validate_async(self):
+        items = list(range(1000))
+        items[min(set(range(1000)) - set(self.listtype.sampled_positions(1000)))] = 'blarg'
+        self.assertIsNone(asyncio.run(self.listtype.validate_async(items)))
+
+    def test_validate_length(self):
+        listtype = validation.List(validation.Int(), max_items=50, sample=1)
+        self.assertRaises(validation.ValidationError, listtype.validate, list(range(51)))
+
+    def test_iterable(self):
+        items = list(range(100))
+        items[min(set(range(100)) - set(self.listtype.sampled_positions(100)))] = 'blarg'
+        self.assertIsNone(self.listtype.validate(tuple(items)))
+        self.assertRaises(validation.ValidationError, self.listtype.validate, iter(items))
+
+    def test_disabled(self):
+        items = list(range(1000))
+        items[min(set(range(1000)) - set(self.listtype.sampled_positions(1000)))] = 'blarg'
+        with patch.object(validation, 'SAMPLING', False):
+            self.assertRaises(validation.ValidationError, self.listtype.validate, items)
+            self.assertRaises(validation.ValidationError, asyncio.run, self.listtype.validate_async(items))
+
+    def test_sampled_positions_unseeded(self):
+        listtype = validation.List(validation.Int(), sample=10, sample_edges=5)
+        self.assertIsNone(listtype.sample_seed)
+        picked = {tuple(listtype.sampled_positions(1000)) for _ in range(10)}
+        self.assertGreater(len(picked), 1)
+        for positions in picked:
+            self.assertEqual(len(positions), 20)
+            self.assertEqual(positions[:5], (0, 1, 2, 3, 4))
+        items = list(range(1000))
+        positions = listtype.validate_sample(items)
+        unchecked = min(set(range(1000)) - set(positions))
+        items[unchecked] = 'blarg'
+        for _ in range(2000):
+            try:
+                listtype.validate(items)
+            except validation.ValidationError:
+                break
+        else:
+            self.fail('position {0} was never checked'.format(unchecked))
+
+    def test_validate_sample(self):
+        items = list(range(1000))
+        self.assertEqual(self.listtype.validate_sample(items), self.listtype.sampled_positions(1000))
+        self.assertIsNone(self.listtype.validate_sample(iter(items)))
+        self.assertIsNone(validation.List(validation.Int()).validate_sample(items))
+        with patch.object(validation, 'SAMPLING', False):
+            self.assertIsNone(self.listtype.validate_sample(items))
+        items[self.listtype.sampled_positions(1000)[7]] = 'blarg'
+        self.assertRaises(validation.ValidationError, self.listtype.validate_sample, items)
+
+    def test_env_flag(self):
+        for value, expected in [('1', True), ('true', True), ('Yes', True), ('0', False), ('false', False),
+                                ('OFF', False), ('', False)]:
+            with patch.dict(os.environ, {'VALIDATION_NO_SAMPLING': value}):
+                self.assertIs(validation._env_flag('VALIDATION_NO_SAMPLING'), expected, value)
+        with patch.dict(os.environ):
+            os.environ.pop('VALIDATION_NO_SAMPLING', None)
+            self.assertFalse(validation._env_flag('VALIDATION_NO_SAMPLING'))
+
+    def test___init__(self):
+        self.assertRaises(ValueError, validation.List, sample=-1)
+        self.assertRaises(ValueError, validation.List, sample=0.0)
+        self.assertRaises(ValueError, validation.List, sample=1.5)
+        self.assertRaises(ValueError, validation.List, sample='10')
+        self.assertRaises(ValueError, validation.List, sample=True)
+        self.assertRaises(ValueError, validation.List, sample=10, unique=True)
+        self.assertRaises(ValueError, validation.List, sample_edges=-1)
+
 
 class TestString(TestCase):
     def test_validate_simple_string(self):
@@ -325,6 +1181,117 @@ class TestString(TestCase):
         stringtype = validation.String(regex='^test.*')
         self.assertRaises(validation.ValidationError, stringtype.validate, 'blargtest test')
 
+    def test_freeze(self):
+        stringtype = validation.String(regex='^test.*').freeze()
+        self.assertIsNone(stringtype.validate('test test'))
+        with self.assertRaises(TypeError):
+            stringtype.regex = '^blarg'
+
+
+class TestStringDate(TestCase):
+    def test_validate_valid(self):
+        datetype = validation.StringDate()
+        self.assertIsNone(datetype.validate('2024-02-29'))
+        self.assertEqual(datetype.parse('2024-02-29'), datetime.date(2024, 2, 29))
+
+    def test_validate_invalid(self):
+        datetype = validation.StringDate()
+        for item in ['2023-02-29', '20240229', '2024-2-29', '2024-02-29T00:00', '２０２４-02-29', '', None, 20240229]:
+            self.assertRaises(validation.ValidationError, datetype.validate, item)
+
+    def test_bounds(self):
+        datetype = validation.StringDate(minval=datetime.date(2000, 1, 1), maxval=datetime.date(2000, 12, 31))
+        self.assertIsNone(datetype.validate('2000-01-01'))
+        self.assertIsNone(datetype.validate('2000-12-31'))
+        with self.assertRaises(validation.ValidationError) as err:
+            datetype.validate('1999-12-31')
+        self.assertEqual(str(err.exception), '1999-12-31 is smaller then minimum value 2000-01-01')
+        with self.assertRaises(validation.ValidationError) as err:
+            datetype.validate('2001-01-01')
+        self.assertEqual(str(err.exception), '2001-01-01 is bigger then maximum value 2000-12-31')
+
+    def test_invalid_bounds(self):
+        self.assertRaises(ValueError, validation.StringDate, minval=datetime.datetime(2000, 1, 1))
+        self.assertRaises(ValueError, validation.StringDate, maxval='2000-01-01')
+        self.assertRaises(
+            ValueError, validation.StringDate, minval=datetime.date(2001, 1, 1), maxval=datetime.date(2000, 1, 1)
+        )
+
+
+class TestStringDateTime(TestCase):
+    def test_validate_valid(self):
+        datetimetype = validation.StringDateTime()
+        for item in [
+            '2024-02-29T10:00', '2024-02-29T10:00:59', '2024-02-29T10:00:59.123', '2024-02-29T10:00:59.123456',
+            '2024-02-29T10:00Z', '2024-02-29T10:00:59+01:00', '2024-02-29T10:00:59.123-05:30',
+        ]:
+            self.assertIsNone(datetimetype.validate(item), item)
+
+    def test_validate_invalid(self):
+        datetimetype = validation.StringDateTime()
+        for item in [
+            '2024-02-29', '2024-02-29T10', '2024-02-29 10:00', '20240229T1000', '2024-02-29T25:00',
+            '2024-02-29T10:00:59.1', '2024-02-29T10:00+0100', '2024-02-29T10:00z', '2024-02-29T10:00+24:00', None,
+            '', 'Z', '2024-02-29T10:0:590', '2024-02-29T10:00:59.12345x', '2024-02-29T10:00:59,123',
+        ]:
+            self.assertRaises(validation.ValidationError, datetimetype.validate, item)
+
+    def test_parse(self):
+        datetimetype = validation.StringDateTime()
+        self.assertEqual(
+            datetimetype.parse('2024-02-29T10:00:59.500Z'),
+            datetime.datetime(2024, 2, 29, 10, 0, 59, 500000, tzinfo=datetime.timezone.utc)
+        )
+        self.assertEqual(datetimetype.parse('2024-02-29T10:00'), datetime.datetime(2024, 2, 29, 10, 0))
+
+    def test_require_tz(self):
+        datetimetype = validation.StringDateTime(require_tz=True)
+        self.assertTrue(datetimetype.require_tz)
+        self.assertIsNone(datetimetype.validate('2024-02-29T10:00:00+01:00'))
+        with self.assertRaises(validation.ValidationError) as err:
+            datetimetype.validate('2024-02-29T10:00:00')
+        self.assertEqual(str(err.exception), '2024-02-29T10:00:00 has no utc offset')
+
+    def test_bounds(self):
+        minval = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+        datetimetype = validation.StringDateTime(minval=minval, require_tz=True)
+        self.assertIs(datetimetype.minval, minval)
+        self.assertIsNone(datetimetype.maxval)
+        self.assertIsNone(datetimetype.validate('2024-01-01T00:00Z'))
+        self.assertRaises(validation.ValidationError, datetimetype.validate, '2024-01-01T00:30+01:00')
+
+    def test_bounds_naive(self):
+        datetimetype = validation.StringDateTime(maxval=datetime.datetime(2024, 1, 1))
+        self.assertIsNone(datetimetype.validate('2023-12-31T23:59'))
+        with self.assertRaises(validation.ValidationError) as err:
+            datetimetype.validate('2023-12-31T23:59Z')
+        self.assertEqual(
+            str(err.exception), '2023-12-31T23:59Z cannot be compared to the bounds, only one of them has a utc offset'
+        )
+
+
+class TestStringTime(TestCase):
+    def test_validate_valid(self):
+        timetype = validation.StringTime()
+        for item in ['00:00', '23:59:59', '12:30:00.250', '12:30Z', '12:30:00.250000+02:00']:
+            self.assertIsNone(timetype.validate(item), item)
+
+    def test_validate_invalid(self):
+        timetype = validation.StringTime()
+        for item in ['24:00', '1230', '12:30:0', '12', 'Z', '', '2024-02-29T12:30', '12-30', '12:30:00.12', '12:30+01', 1230]:
+            self.assertRaises(validation.ValidationError, timetype.validate, item)
+
+    def test_parse(self):
+        timetype = validation.StringTime(require_tz=True)
+        self.assertEqual(timetype.parse('12:30Z'), datetime.time(12, 30, tzinfo=datetime.timezone.utc))
+        self.assertRaises(validation.ValidationError, timetype.parse, '12:30')
+
+    def test_bounds(self):
+        timetype = validation.StringTime(minval=datetime.time(8), maxval=datetime.time(18))
+        self.assertIsNone(timetype.validate('08:00'))
+        self.assertRaises(validation.ValidationError, timetype.validate, '07:59:59.999')
+        self.assertRaises(validation.ValidationError, timetype.validate, '18:00:01')
+
 
 class TestStringUUID(TestCase):
     def test_validate_valid(self):
@@ -357,3 +1324,14 @@ class TestTuple(TestCase):
         tupletype.add_element(validation.Int())
         tupletype.add_element(validation.String())
         self.assertRaises(validation.ValidationError, tupletype.validate, [True, 42, 'blarg', None])
+
+    def test_freeze(self):
+        tupletype = validation.Tuple()
+        tupletype.add_element(validation.Bool())
+        tupletype.add_element(validation.Int())
+        tupletype.freeze()
+
+        self.assertIsNone(tupletype.validate([True, 42]))
+        self.assertRaises(validation.ValidationError, tupletype.validate, [True, False])
+        self.assertRaises(TypeError, tupletype.add_element, validation.String())
+        self.assertIsInstance(tupletype.elements, tuple)
@@ -1,7 +1,18 @@
 __author__ = 'schlitzer'
-
+__version__ = '0.0.1'
+
+import asyncio
+import collections.abc
+import contextvars
+import datetime
+import itertools
+import math
+import os
+import random
 import re
 import socket
+import time
+import types
 import uuid
 
 
@@ -9,12 +20,438 @@ class ValidationError(Exception):
     pass
 
 
+class ValidationTimeout(ValidationError):
+    """ Raised if validation did not finish before its deadline
+
+    The message contains the path validation had reached.
+    """
+    pass
+
+
+class _Pass(object):
+    """ State of a running validation pass
+
+    Holds the deadline, whose clock is only read every INTERVAL ticks, and the
+    memo of containers that already have been validated during the pass.
+    """
+    __slots__ = ('_deadline', '_count', '_memo', '_content')
+
+    INTERVAL = 256
+
+    def __init__(self, deadline=None, memo=False):
+        self._deadline = deadline
+        self._count = 1
+        self._memo = {} if memo else None
+        self._content = memo == 'content'
+
+    def tick(self):
+        if self._deadline is None:
+            return
+        self._count -= 1
+        if self._count > 0:
+            return
+        self._count = self.INTERVAL
+        if time.monotonic() > self._deadline:
+            raise ValidationTimeout('deadline exceeded')
+
+    def validate(self, validator, item):
+        memo = self._memo
+        if memo is None:
+            validator._validate(item, self)
+            return
+        key = (id(validator), id(item))
+        if key in memo:
+            return
+        content = None
+        if self._content and validator._frozen:
+            content = _content_key(item)
+            if content is not None:
+                cache = validator._content
+                if cache is None:
+                    cache = validator._content = {}
+                if content in cache:
+                    memo[key] = item
+                    return
+        validator._validate(item, self)
+        memo[key] = item
+        if content is not None:
+            if len(cache) >= CONTENT_MEMO_SIZE:
+                cache.clear()
+            cache[content] = None
+
+
+# maximum number of items remembered per Type Validator by memo='content'
+CONTENT_MEMO_SIZE = 4096
+
+# maximum number of resolved paths remembered per frozen Type Validator by validate_at
+PATH_CACHE_SIZE = 1024
+
+
+def _env_flag(name):
+    """ Read a boolean from the environment, unset, empty, 0, false, no and off are False
+
+    :return: Boolean
+    """
+    return os.environ.get(name, '').strip().lower() not in ('', '0', 'false', 'no', 'off')
+
+
+# List Type Validators with sample only check a sample of the members, set to
+# False, or set $VALIDATION_NO_SAMPLING=1, to validate all members, like in tests
+SAMPLING = not _env_flag('VALIDATION_NO_SAMPLING')
+
+_SCALARS = frozenset((str, bytes, int, float, bool, type(None)))
+
+# iterables List Type Validators reject, they are JSON objects and strings, not arrays
+_NOT_LISTS = (str, bytes, bytearray, collections.abc.Mapping, collections.abc.Set)
+
+_pass = contextvars.ContextVar('validation_pass', default=None)
+
+
+def _content_key(item):
+    """ Hashable key that only equals the key of items with equal content and types
+
+    :return: key, or None for mutable items
+    """
+    kind = type(item)
+    if kind in _SCALARS:
+        return kind, item
+    if kind is tuple:
+        members = tuple(_content_key(member) for member in item)
+        if None in members:
+            return None
+        return kind, members
+    if kind is frozenset:
+        members = frozenset(_content_key(member) for member in item)
+        if None in members:
+            return None
+        return kind, members
+    return None
+
+
+class _AsyncPass(object):
+    """ State of a running validate_async pass
+
+    Counts the members checked since validation last yielded to the event
+    loop. Validation yields after interval members, or once budget seconds
+    have passed, the clock is only read every CLOCK members.
+    """
+    __slots__ = ('_interval', '_budget', '_count', '_start', 'executor', 'offload_size')
+
+    CLOCK = 64
+
+    def __init__(self, interval, budget, executor, offload_size):
+        self._interval = interval
+        self._budget = budget
+        self._count = 0
+        self._start = time.monotonic()
+        self.executor = executor
+        self.offload_size = offload_size
+
+    def tick(self):
+        """ Count a member
+
+        :return: Boolean, indicating if validation should yield
+        """
+        self._count += 1
+        if self._interval is not None and self._count >= self._interval:
+            return True
+        if self._budget is not None and self._count % self.CLOCK == 0:
+            return time.monotonic() - self._start >= self._budget
+        return False
+
+    async def pause(self):
+        await asyncio.sleep(0)
+        self._count = 0
+        self._start = time.monotonic()
+
+    async def validate(self, validator, item):
+        if self.tick():
+            await self.pause()
+        if isinstance(validator, BaseContainer):
+            await validator._validate_async(item, self)
+        else:
+            validator.validate(item)
+
+
 class Base(object):
+    __slots__ = ()
+
+    def freeze(self):
+        """ Make the Type Validator and all its children immutable
+
+        A frozen Type Validator precomputes its lookup structures and rejects
+        later changes with a TypeError, so it can be shared between threads
+        without locking.
+
+        :return: self
+        """
+        return self
+
     def validate(self, item):
         raise NotImplementedError
 
+    async def validate_async(self, item, interval=1000, budget=0.001, executor=None, offload_size=None):
+        """ Validate item without blocking the event loop
+
+        Runs the same checks as validate, but yields to the event loop every
+        interval members, or once budget seconds have passed. Items of a List
+        Type Validator with at least offload_size members are validated in
+        batches of offload_size members in executor, or the default executor
+        of the loop.
+
+        :param interval: Optional number of members checked between yields
+        :param budget: Optional seconds validation may run between yields
+        :param executor: Optional concurrent.futures.Executor used for offloaded batches
+        :param offload_size: Optional number of members from which lists are offloaded
+        :return: None, ValidationError
+        """
+        if offload_size is not None and offload_size < 1:
+            raise ValueError('offload_size has to be positive')
+        await _AsyncPass(interval, budget, executor, offload_size).validate(self, item)
+
+    def validate_patch(self, original, patch):
+        """ Validate the result of applying a JSON merge patch to original
+
+        original has to be valid already. The result is the same as validating
+        merge_patch(original, patch), but only the parts touched by the patch are checked.
+
+        :return: None, ValidationError
+        """
+        self.validate(merge_patch(original, patch))
+
+    def validate_at(self, item, path):
+        """ Validate only the member of item at path
+
+        path is a JSON pointer like /items/3/price. The path is resolved against
+        the validator tree, resolutions are cached for frozen trees. Missing
+        optional members and list positions beyond the end of the list are valid.
+
+        :param path: JSON pointer
+        :return: None, ValidationError, ValueError if path does not resolve against the validator tree
+        """
+        if isinstance(self, BaseContainer) and self._frozen:
+            cache = self._paths
+            if cache is None:
+                cache = self._paths = {}
+            resolved = cache.get(path)
+            if resolved is None:
+                resolved = _resolve_path(self, path)
+                if len(cache) >= PATH_CACHE_SIZE:
+                    cache.clear()
+                cache[path] = resolved
+            steps, validator = resolved
+        else:
+            steps, validator = _resolve_path(self, path)
+        prefix = ''
+        for kind, key, container in steps:
+            try:
+                if kind == 'tuple':
+                    length = len(container.elements)
+                    if len(item) != length:
+                        raise ValidationError("unexpected length, expected {0} but is {1}".format(length, len(item)))
+                    item = item[key]
+                    prefix += "[{0}]".format(key)
+                elif kind == 'list':
+                    try:
+                        item = item[key]
+                    except IndexError:
+                        return
+                    except (KeyError, TypeError):
+                        raise ValidationError("is not a list")
+                    prefix += "list position [{0}] ".format(key)
+                else:
+                    if type(item) is not dict:
+                        raise ValidationError("is not a dictionary")
+                    try:
+                        item = item[key]
+                    except KeyError:
+                        if kind == 'required':
+                            raise ValidationError("required member {0} missing".format(key))
+                        return
+                    prefix += "{0} member {1} ".format(kind, key)
+            except ValidationError as err:
+                raise ValidationError("{0}{1}".format(prefix, err))
+        try:
+            validator.validate(item)
+        except ValidationError as err:
+            raise type(err)("{0}{1}".format(prefix, err))
+
+
+class BaseContainer(Base):
+    """ Base for Type Validators holding other Type Validators
+
+    Subclasses implement _validate(item, state), state being the running
+    validation pass or None.
+    """
+    __slots__ = ('_frozen', '_content', '_paths')
+
+    def _validate(self, item, state):
+        raise NotImplementedError
+
+    async def _validate_async(self, item, state):
+        raise NotImplementedError
+
+    def validate(self, item, deadline=None, memo=False):
+        """ Validate item
+
+        With memo, containers that already have been validated during this call
+        are skipped, keyed by object identity. memo='content' additionally
+        remembers immutable items (tuples, frozensets and scalars) that passed a
+        frozen Type Validator across calls, keyed by their content.
+
+        :param deadline: Optional time.monotonic() timestamp validation has to finish by
+        :param memo: False, True or 'content'
+        :return: None, ValidationError, ValidationTimeout
+        """
+        if deadline is not None or memo:
+            state = _Pass(deadline, memo)
+            token = _pass.set(state)
+            try:
+                state.validate(self, item)
+            finally:
+                _pass.reset(token)
+            return
+        state = _pass.get()
+        if state is None:
+            self._validate(item, None)
+        else:
+            state.validate(self, item)
+
+
+# separators of HH:MM[:SS[.fff[fff]]] by the length of the clock, as the end of
+# the separators and every third character of the clock starting at the third
+_CLOCKS = {5: (3, ':'), 8: (6, '::'), 12: (9, '::.'), 15: (9, '::.')}
+
+# the same for YYYY-MM-DDTHH:MM[:SS[.fff[fff]]], starting at the fifth character
+_DATETIMES = {length: (stop + 11, '--T' + separators) for length, (stop, separators) in _CLOCKS.items()}
+
+
+def _parse_date(item):
+    if len(item) != 10 or item[4:8:3] != '--':
+        return None
+    try:
+        return datetime.date.fromisoformat(item)
+    except ValueError:
+        return None
+
+
+def _parse_datetime(item):
+    length = len(item)
+    if length < 16:
+        return None
+    if item[-1] == 'Z':
+        layout = _DATETIMES.get(length - 12)
+        item = item[:-1] + '+00:00'
+    elif item[-6] in '+-' and item[-3] == ':':
+        layout = _DATETIMES.get(length - 17)
+    else:
+        layout = _DATETIMES.get(length - 11)
+    if layout is None or item[4:layout[0]:3] != layout[1]:
+        return None
+    try:
+        return datetime.datetime.fromisoformat(item)
+    except ValueError:
+        return None
+
+
+def _parse_time(item):
+    length = len(item)
+    if length < 5:
+        return None
+    if item[-1] == 'Z':
+        layout = _CLOCKS.get(length - 1)
+        item = item[:-1] + '+00:00'
+    elif length > 10 and item[-6] in '+-' and item[-3] == ':':
+        layout = _CLOCKS.get(length - 6)
+    else:
+        layout = _CLOCKS.get(length)
+    if layout is None or item[2:layout[0]:3] != layout[1]:
+        return None
+    try:
+        return datetime.time.fromisoformat(item)
+    except ValueError:
+        return None
+
+
+class BaseDateTime(Base):
+    """ Base for ISO 8601 date and time strings
+
+    The separators are checked at their fixed positions with a single slice,
+    the string is then parsed by fromisoformat, which checks the digits.
+    Subclasses set _type, _typename and _parser.
+    """
+    __slots__ = ('_minval', '_maxval', '_require_tz')
+
+    def __init__(self, minval, maxval, require_tz):
+        if minval is not None and type(minval) is not self._type:
+            raise ValueError('minval is not a {0}'.format(self._type.__name__))
+        if maxval is not None and type(maxval) is not self._type:
+            raise ValueError('maxval is not a {0}'.format(self._type.__name__))
+        if minval is not None and maxval is not None:
+            if minval > maxval:
+                raise ValueError('min value bigger then max value')
+        self._minval = minval
+        self._maxval = maxval
+        self._require_tz = require_tz
+
+    @property
+    def minval(self):
+        """ Minimum value
+
+        :return: Minimum value or None
+        """
+        return self._minval
+
+    @property
+    def maxval(self):
+        """ Maximum value
+
+        :return: Maximum value or None
+        """
+        return self._maxval
+
+    @property
+    def require_tz(self):
+        """ Indicates if a UTC offset is required
+
+        :return: Boolean
+        """
+        return self._require_tz
+
+    def parse(self, item):
+        """ Validate item and return the parsed value
+
+        :return: parsed value, ValidationError
+        """
+        if type(item) is not str:
+            raise ValidationError('is not a string')
+        value = self._parser(item) if item.isascii() else None
+        if value is None:
+            raise ValidationError('{0} is not a iso 8601 {1}'.format(item, self._typename))
+        if self._require_tz and value.tzinfo is None:
+            raise ValidationError('{0} has no utc offset'.format(item))
+        try:
+            if self._minval is not None:
+                if self._minval > value:
+                    raise ValidationError('{0} is smaller then minimum value {1}'.format(item, self._minval.isoformat()))
+            if self._maxval is not None:
+                if self._maxval < value:
+                    raise ValidationError('{0} is bigger then maximum value {1}'.format(item, self._maxval.isoformat()))
+        except TypeError:
+            raise ValidationError('{0} cannot be compared to the bounds, only one of them has a utc offset'.format(item))
+        return value
+
+    def validate(self, item):
+        """ Validate item
+
+        :return: None, ValidationError
+        """
+        self.parse(item)
+
 
 class BaseNumber(Base):
+    __slots__ = ('_typenum', '_typename', '_minval', '_maxval')
+
     def __init__(self, typenum, typename, minval, maxval):
         self._typenum = typenum
         self._typename = typename
@@ -43,10 +480,29 @@ class BaseNumber(Base):
                 raise ValidationError('{0} is bigger then maximum value {1}'.format(item, self._maxval))
 
 
-class Bool(Base):
+class BaseSingleton(Base):
+    """ Base for parameterless Type Validators
+
+    Type Validators without parameters carry no state, so all instantiations
+    return the same shared instance.
+    """
+    __slots__ = ()
+    _instance = None
+
+    def __new__(cls):
+        instance = cls.__dict__.get('_instance')
+        if instance is None:
+            instance = super().__new__(cls)
+            cls._instance = instance
+        return instance
+
+
+class Bool(BaseSingleton):
     """ Validate that item is a boolean
 
     """
+    __slots__ = ()
+
     def validate(self, item):
         """Validate Item
 
@@ -61,27 +517,54 @@ class Choice(Base):
 
     :param choices: List of allowed choices
     """
+    __slots__ = ('_choices', '_lookup')
+
     def __init__(self, choices):
         self._choices = choices
+        self._lookup = choices
+
+    def freeze(self):
+        self._choices = tuple(self._choices)
+        try:
+            self._lookup = frozenset(self._choices)
+        except TypeError:
+            self._lookup = tuple(self._choices)
+        return self
 
     def validate(self, item):
         """ Validate that item is in the list of valid choices
 
         :return: None, ValidationError
         """
-        if item not in self._choices:
+        try:
+            valid = item in self._lookup
+        except TypeError:
+            valid = False
+        if not valid:
             raise ValidationError("should be any of {0} actually is: {1}".format(self._choices, item))
 
 
-class Dict(Base):
+class Dict(BaseContainer):
     """ Validate Dictionaries
 
     :param ignore_unknown: Boolean, indicating if unknown members should be ignored or not
+    :param adaptive: Boolean, indicating if members that often fail cheaply should be checked first
     """
-    def __init__(self, ignore_unknown=True):
+    __slots__ = (
+        '_req_mem', '_opt_mem', '_pat_mem', '_ignore', '_req_checks', '_opt_checks', '_known', '_pat_checks',
+        '_pat_cache', '_adaptive'
+    )
+
+    def __init__(self, ignore_unknown=True, adaptive=False):
         self._req_mem = {}
         self._opt_mem = {}
+        self._pat_mem = {}
         self._ignore = ignore_unknown
+        self._frozen = False
+        self._content = None
+        self._paths = None
+        self._pat_cache = ((), None)
+        self._adaptive = _AdaptiveOrder() if adaptive else None
 
     @property
     def required(self):
@@ -103,44 +586,356 @@ class Dict(Base):
         """
         return self._opt_mem
 
-    def validate(self, item):
+    @property
+    def patterns(self):
+        """ Dictionary holding optional members whose keys match a regex
+
+        The key is a regex string, the value should be a instance of a Type
+        Validator. Members that are neither required nor optional are validated
+        by the first pattern that matches their key from the start, like
+        re.match. All patterns are combined into a single regex, so they must
+        not use numbered backreferences or global inline flags.
+
+        :return: dict with pattern members
+        """
+        return self._pat_mem
+
+    def pattern_validator(self, key):
+        """ Type Validator of the first pattern matching key
+
+        :param key: Member key
+        :return: Type Validator Instance, or None if no pattern matches
+        """
+        if type(key) is not str:
+            return None
+        patterns = self._patterns()
+        if patterns is None:
+            return None
+        match = patterns[0].match(key)
+        if match is None:
+            return None
+        return patterns[2][match.lastgroup]
+
+    def _patterns(self):
+        """ Combined pattern regex, see _combine_patterns
+
+        Unfrozen Type Validators keep the combined regex until the patterns change.
+
+        :return: tuple or None
+        """
+        if self._frozen:
+            return self._pat_checks
+        snapshot = tuple(self._pat_mem.items())
+        cached, checks = self._pat_cache
+        if snapshot != cached:
+            checks = _combine_patterns(self._pat_mem)
+            self._pat_cache = (snapshot, checks)
+        return checks
+
+    def freeze(self):
+        if self._frozen:
+            return self
+        self._req_mem = types.MappingProxyType(dict(self._req_mem))
+        self._opt_mem = types.MappingProxyType(dict(self._opt_mem))
+        self._pat_mem = types.MappingProxyType(dict(self._pat_mem))
+        self._req_checks, self._opt_checks, self._known, self._pat_checks = self._members()
+        self._frozen = True
+        for validator in self._req_mem.values():
+            validator.freeze()
+        for validator in self._opt_mem.values():
+            validator.freeze()
+        for validator in self._pat_mem.values():
+            validator.freeze()
+        return self
+
+    def _members(self):
+        """ Checks to run against a dictionary
+
+        :return: tuple of (key, validate) pairs for required and optional members, all known keys,
+            and the combined pattern regex with dicts mapping its groups to validate and validators, or None
+        """
+        if self._frozen:
+            return self._req_checks, self._opt_checks, self._known, self._pat_checks
+        return (
+            tuple((key, validator.validate) for key, validator in self._req_mem.items()),
+            tuple((key, validator.validate) for key, validator in self._opt_mem.items()),
+            frozenset(self._req_mem.keys() | self._opt_mem.keys()),
+            self._patterns()
+        )
+
+    def _validate(self, item, state):
         """ Validate Dictionary
 
         :return: None, ValidationError
         """
         if type(item) is not dict:
             raise ValidationError("is not a dictionary")
-        keys = set(item.keys())
+        required, optional, known, patterns = self._members()
+        if self._adaptive is not None:
+            if self._adaptive.passes(item, required, optional, state):
+                if patterns is not None:
+                    self._validate_patterns(item, known, patterns, state)
+                    return
+                if self._ignore or not item.keys() - known:
+                    return
+
+        for key, check in required:
+            try:
+                value = item[key]
+            except KeyError:
+                raise ValidationError("required member {0} missing".format(key))
+            try:
+                if state is not None:
+                    state.tick()
+                check(value)
+            except ValidationError as err:
+                raise type(err)("required member {0} {1}".format(key, err))
+
+        for key, check in optional:
+            try:
+                value = item[key]
+            except KeyError:
+                continue
+            try:
+                if state is not None:
+                    state.tick()
+                check(value)
+            except ValidationError as err:
+                raise type(err)("optional member {0} {1}".format(key, err))
+
+        if patterns is not None:
+            self._validate_patterns(item, known, patterns, state)
+        elif not self._ignore:
+            keys = item.keys() - known
+            if len(keys) > 0:
+                raise ValidationError("got unknown members: {0}".format(keys))
 
-        for key, validator in self.required.items():
+    def _validate_patterns(self, item, known, patterns, state):
+        """ Validate members that are neither required nor optional against the patterns
+
+        :return: None, ValidationError
+        """
+        match = patterns[0].match
+        checks = patterns[1]
+        keys = set()
+        for key, value in item.items():
+            if key in known:
+                continue
+            found = match(key) if type(key) is str else None
+            if found is None:
+                if not self._ignore:
+                    keys.add(key)
+                continue
             try:
-                validator.validate(item[key])
-                keys.remove(key)
+                if state is not None:
+                    state.tick()
+                checks[found.lastgroup](value)
             except ValidationError as err:
-                raise ValidationError("required member {0} {1}".format(key, err))
+                raise type(err)("pattern member {0} {1}".format(key, err))
+        if len(keys) > 0:
+            raise ValidationError("got unknown members: {0}".format(keys))
+
+    async def _validate_async(self, item, state):
+        """ Validate Dictionary, members are checked in declared order
+
+        :return: None, ValidationError
+        """
+        if type(item) is not dict:
+            raise ValidationError("is not a dictionary")
+
+        for key, validator in self._req_mem.items():
+            try:
+                value = item[key]
             except KeyError:
                 raise ValidationError("required member {0} missing".format(key))
-
-        for key, validator in self.optional.items():
             try:
-                validator.validate(item[key])
-                keys.remove(key)
+                await state.validate(validator, value)
             except ValidationError as err:
-                raise ValidationError("optional member {0} {1}".format(key, err))
+                raise type(err)("required member {0} {1}".format(key, err))
+
+        for key, validator in self._opt_mem.items():
+            try:
+                value = item[key]
             except KeyError:
-                pass
+                continue
+            try:
+                await state.validate(validator, value)
+            except ValidationError as err:
+                raise type(err)("optional member {0} {1}".format(key, err))
+
+        patterns = self._patterns()
+        if patterns is not None:
+            known = self._req_mem.keys() | self._opt_mem.keys()
+            match = patterns[0].match
+            keys = set()
+            for key, value in item.items():
+                if key in known:
+                    continue
+                found = match(key) if type(key) is str else None
+                if found is None:
+                    if not self._ignore:
+                        keys.add(key)
+                    continue
+                try:
+                    await state.validate(patterns[2][found.lastgroup], value)
+                except ValidationError as err:
+                    raise type(err)("pattern member {0} {1}".format(key, err))
+        elif not self._ignore:
+            keys = item.keys() - self._req_mem.keys() - self._opt_mem.keys()
+        else:
+            keys = ()
+        if len(keys) > 0:
+            raise ValidationError("got unknown members: {0}".format(keys))
+
+    def validate_patch(self, original, patch):
+        if type(patch) is not dict or type(original) is not dict:
+            self.validate(merge_patch(original, patch))
+            return
+        keys = set()
+        for key, value in patch.items():
+            validator = self._req_mem.get(key)
+            kind = 'required'
+            if validator is None:
+                validator = self._opt_mem.get(key)
+                kind = 'optional'
+            if validator is None:
+                validator = self.pattern_validator(key)
+                kind = 'pattern'
+            if value is None:
+                if kind == 'required' and validator is not None:
+                    raise ValidationError("required member {0} missing".format(key))
+                continue
+            if validator is None:
+                keys.add(key)
+                continue
+            try:
+                validator.validate_patch(original.get(key), value)
+            except ValidationError as err:
+                raise type(err)("{0} member {1} {2}".format(kind, key, err))
 
         if not self._ignore:
             if len(keys) > 0:
                 raise ValidationError("got unknown members: {0}".format(keys))
 
 
+def _combine_patterns(patterns):
+    """ Combine the regexes of pattern members into one, every regex becomes the named group _p<n>
+
+    :return: tuple of compiled regex, dict of group name to validate, dict of group name to validator, or None
+    """
+    if not patterns:
+        return None
+    groups = ['(?P<_p{0}>(?:{1}))'.format(pos, pattern) for pos, pattern in enumerate(patterns)]
+    try:
+        regex = re.compile('|'.join(groups))
+    except re.error as err:
+        raise ValueError('patterns cannot be combined: {0}'.format(err))
+    validators = {'_p{0}'.format(pos): validator for pos, validator in enumerate(patterns.values())}
+    checks = {name: validator.validate for name, validator in validators.items()}
+    return regex, checks, validators
+
+
+class _AdaptiveOrder(object):
+    """ Order of Dict member checks, adapted to observed failures and costs
+
+    Members are checked ordered by failure rate per second of check time. The
+    cost of checks is sampled every SAMPLE calls, the order is recomputed
+    every REORDER calls. Checks stop at the first failure, except on sampled
+    calls, which check all members, so members behind an often failing one
+    still collect failures and costs. Once a check fails, Dict.validate
+    verifies the item again in declared order, so the reported error does not
+    depend on the adapted order.
+    """
+    __slots__ = ('_required', '_optional', '_members', '_order', '_failures', '_costs', '_calls')
+
+    SAMPLE = 16
+    REORDER = 1024
+
+    def __init__(self):
+        self._required = None
+        self._optional = None
+        self._calls = 0
+
+    def _reset(self, required, optional):
+        self._required = required
+        self._optional = optional
+        members = [('required', key, check) for key, check in required]
+        members.extend(('optional', key, check) for key, check in optional)
+        self._members = tuple((index,) + member for index, member in enumerate(members))
+        self._order = self._members
+        self._failures = [0] * len(members)
+        self._costs = [0.0] * len(members)
+        self._calls = 0
+
+    def _reorder(self):
+        calls = self._calls
+
+        def score(member):
+            index = member[0]
+            return (self._failures[index] + 1) / (calls + 2) / (self._costs[index] or 1e-9)
+
+        self._order = tuple(sorted(self._members, key=score, reverse=True))
+
+    @property
+    def order(self):
+        """ Member keys in the order they are currently checked
+
+        :return: list of keys
+        """
+        return [key for _, _, key, _ in self._order]
+
+    def passes(self, item, required, optional, state):
+        """ Check members of item in the adapted order
+
+        :return: Boolean, ValidationTimeout
+        """
+        if required is not self._required or optional is not self._optional:
+            if required != self._required or optional != self._optional:
+                self._reset(required, optional)
+        self._calls += 1
+        if self._calls % self.REORDER == 0:
+            self._reorder()
+        timed = self._calls % self.SAMPLE == 0
+        passed = True
+        for index, kind, key, check in self._order:
+            try:
+                value = item[key]
+            except KeyError:
+                if kind == 'required':
+                    self._failures[index] += 1
+                    if not timed:
+                        return False
+                    passed = False
+                continue
+            try:
+                if state is not None:
+                    state.tick()
+                if timed:
+                    start = time.perf_counter()
+                    try:
+                        check(value)
+                    finally:
+                        self._costs[index] = 0.9 * self._costs[index] + 0.1 * (time.perf_counter() - start)
+                else:
+                    check(value)
+            except ValidationTimeout as err:
+                raise ValidationTimeout("{0} member {1} {2}".format(kind, key, err))
+            except ValidationError:
+                self._failures[index] += 1
+                if not timed:
+                    return False
+                passed = False
+        return passed
+
+
 class Float(BaseNumber):
     """ Validate Floats
 
     :param minval: Optional Minimum allowed value
     :param maxval: Optional Maximum allowed value
     """
+    __slots__ = ()
+
     def __init__(self, minval=None, maxval=None):
         super().__init__(typenum=float, typename='float', minval=minval, maxval=maxval)
 
@@ -151,17 +946,21 @@ class Int(BaseNumber):
     :param minval: Optional Minimum allowed value
     :param maxval: Optional Maximum allowed value
     """
+    __slots__ = ()
+
     def __init__(self, minval=None, maxval=None):
         super().__init__(typenum=int, typename='integer', minval=minval, maxval=maxval)
 
 
-class IP(Base):
+# shared by all IP:Port Type Validators
+_PORT = Int(minval=1, maxval=65535)
+
+
+class IP(BaseSingleton):
     """ Validate if item is a valid IPv4 or IPv6 address
 
     """
-    def __init__(self):
-        self._ipv4 = IPv4()
-        self._ipv6 = IPv6()
+    __slots__ = ()
 
     def validate(self, item):
         """ Validate IP
@@ -169,21 +968,19 @@ class IP(Base):
         :return: None, ValidationError
         """
         try:
-            self._ipv4.validate(item)
+            _IPV4.validate(item)
         except ValidationError:
             try:
-                self._ipv6.validate(item)
+                _IPV6.validate(item)
             except ValidationError:
                 raise ValidationError("not a IPv4 or IPv6 address")
 
 
-class IPPort(Base):
+class IPPort(BaseSingleton):
     """ Validate if item is a valid IPv4 or IPv6 address with Port
 
     """
-    def __init__(self):
-        self._port = Int(minval=1, maxval=65535)
-        self._ip = IP()
+    __slots__ = ()
 
     def validate(self, item):
         """ Validate IP:Port
@@ -191,17 +988,19 @@ class IPPort(Base):
         :return: None, ValidationError
         """
         ip, port = item.rsplit(':', 1)
-        self._ip.validate(ip)
+        _IP.validate(ip)
         try:
-            self._port.validate(int(port))
+            _PORT.validate(int(port))
         except ValidationError:
             raise ValidationError("port outside valid range")
 
 
-class IPv4(Base):
+class IPv4(BaseSingleton):
     """ Validate that IPv4 addresses
 
     """
+    __slots__ = ()
+
     def validate(self, item):
         """ Validate IP
 
@@ -213,10 +1012,8 @@ class IPv4(Base):
             raise ValidationError('not a IPv4 address')
 
 
-class IPv4Port(Base):
-    def __init__(self):
-        self._port = Int(minval=1, maxval=65535)
-        self._ip = IPv4()
+class IPv4Port(BaseSingleton):
+    __slots__ = ()
 
     def validate(self, item):
         """ Validate IP:Port
@@ -224,19 +1021,18 @@ class IPv4Port(Base):
         :return: None, ValidationError
         """
         ip, port = item.rsplit(':', 1)
-        self._ip.validate(ip)
+        _IPV4.validate(ip)
         try:
-            self._port.validate(int(port))
+            _PORT.validate(int(port))
         except ValidationError:
             raise ValidationError("port outside valid range")
 
 
-class IPv6(Base):
+class IPv6(BaseSingleton):
     """ Validate IPv6 Addresses
 
     """
-    def __init__(self):
-        self._port = Int(minval=1, maxval=65535)
+    __slots__ = ()
 
     def validate(self, item):
         """ Validate IP
@@ -249,10 +1045,8 @@ class IPv6(Base):
             raise ValidationError('not a IPv6 address')
 
 
-class IPv6Port(Base):
-    def __init__(self):
-        self._port = Int(minval=1, maxval=65535)
-        self._ip = IPv6()
+class IPv6Port(BaseSingleton):
+    __slots__ = ()
 
     def validate(self, item):
         """ Validate IP:Port
@@ -260,20 +1054,64 @@ class IPv6Port(Base):
         :return: None, ValidationError
         """
         ip, port = item.rsplit(':', 1)
-        self._ip.validate(ip)
+        _IPV6.validate(ip)
         try:
-            self._port.validate(int(port))
+            _PORT.validate(int(port))
         except ValidationError:
             raise ValidationError("port outside valid range")
 
 
-class List(Base):
+# shared by the IP and IP:Port Type Validators, resolved when validating
+_IP = IP()
+_IPV4 = IPv4()
+_IPV6 = IPv6()
+
+
+class List(BaseContainer):
     """ Validate that all members of the list are from the same type
 
     :parem validator: A Type Validator Instance
+    :param min_items: Optional Minimum number of members
+    :param max_items: Optional Maximum number of members
+    :param unique: Boolean, indicating if members have to be unique
+    :param sample: Optional number, or fraction between 0 and 1, of members checked between the edges
+    :param sample_edges: Number of members checked at the start and at the end of the list when sampling
+    :param sample_seed: Optional seed used to pick the sampled members, None picks new members on every call
     """
-    def __init__(self, validator=None):
+    __slots__ = ('_validator', '_min_items', '_max_items', '_unique', '_sample', '_sample_edges', '_sample_seed')
+
+    def __init__(self, validator=None, min_items=None, max_items=None, unique=False,
+                 sample=None, sample_edges=16, sample_seed=None):
+        if min_items is not None and type(min_items) is not int:
+            raise ValueError('min_items is not an integer')
+        if max_items is not None and type(max_items) is not int:
+            raise ValueError('max_items is not an integer')
+        if min_items is not None and max_items is not None:
+            if min_items > max_items:
+                raise ValueError('min_items bigger then max_items')
+        if sample is not None:
+            if type(sample) is int:
+                if sample < 0:
+                    raise ValueError('sample is negative')
+            elif type(sample) is float:
+                if not 0.0 < sample <= 1.0:
+                    raise ValueError('sample fraction is not between 0 and 1')
+            else:
+                raise ValueError('sample is not an integer or float')
+            if unique:
+                raise ValueError('unique lists cannot be sampled')
+        if type(sample_edges) is not int or sample_edges < 0:
+            raise ValueError('sample_edges is not a positive integer')
         self._validator = validator
+        self._frozen = False
+        self._content = None
+        self._paths = None
+        self._min_items = min_items
+        self._max_items = max_items
+        self._unique = unique
+        self._sample = sample
+        self._sample_edges = sample_edges
+        self._sample_seed = sample_seed
 
     @property
     def validator(self):
@@ -285,19 +1123,331 @@ class List(Base):
 
     @validator.setter
     def validator(self, value):
+        if self._frozen:
+            raise TypeError('List is frozen')
         self._validator = value
 
-    def validate(self, item):
+    @property
+    def min_items(self):
+        """ Minimum number of members
+
+        :return: int or None
+        """
+        return self._min_items
+
+    @property
+    def max_items(self):
+        """ Maximum number of members
+
+        :return: int or None
+        """
+        return self._max_items
+
+    @property
+    def unique(self):
+        """ Indicates if members have to be unique
+
+        :return: Boolean
+        """
+        return self._unique
+
+    @property
+    def sample(self):
+        """ Number, or fraction, of members checked between the edges, None if all members are checked
+
+        :return: int, float or None
+        """
+        return self._sample
+
+    @property
+    def sample_edges(self):
+        """ Number of members checked at the start and at the end of the list when sampling
+
+        :return: int
+        """
+        return self._sample_edges
+
+    @property
+    def sample_seed(self):
+        """ Seed used to pick the sampled members
+
+        :return: Seed, or None if new members are picked on every call
+        """
+        return self._sample_seed
+
+    def sampled_positions(self, length):
+        """ Positions checked in a list of length members
+
+        The first and last sample_edges positions are always checked, the
+        others are picked at random. Without sample_seed every call picks new
+        positions. With a seed, the same seed and length always pick the same
+        positions, which makes failures reproducible, but leaves the same
+        positions unchecked forever for producers with a fixed batch size.
+
+        :param length: Number of members
+        :return: sorted list of positions
+        """
+        edges = self._sample_edges
+        middle = range(edges, length - edges)
+        if self._sample is None or len(middle) == 0:
+            return list(range(length))
+        if type(self._sample) is float:
+            count = math.ceil(self._sample * len(middle))
+        else:
+            count = self._sample
+        if count >= len(middle):
+            return list(range(length))
+        if self._sample_seed is None:
+            picked = random.sample(middle, count)
+        else:
+            picked = random.Random(self._sample_seed).sample(middle, count)
+        picked.sort()
+        return list(range(edges)) + picked + list(range(length - edges, length))
+
+    def _sampled(self, item):
+        """ Positions to check in item if it is sampled
+
+        :return: list of positions, or None if all members have to be checked
+        """
+        if self._sample is None or not SAMPLING or not isinstance(item, collections.abc.Sequence):
+            return None
+        return self.sampled_positions(len(item))
+
+    def freeze(self):
+        if not self._frozen:
+            self._frozen = True
+            if self._validator is not None:
+                self._validator.freeze()
+        return self
+
+    def validate_length(self, length):
+        """ Validate the number of members against min_items and max_items
+
+        :return: None, ValidationError
+        """
+        if self._min_items is not None and length < self._min_items:
+            raise ValidationError("list has {0} items, expected at least {1}".format(length, self._min_items))
+        if self._max_items is not None and length > self._max_items:
+            raise ValidationError("list has {0} items, expected at most {1}".format(length, self._max_items))
+
+    def iter_validate(self, item):
+        """ Validate members of item while passing them on
+
+        Works like validate, but yields every member after it has been validated,
+        so validation can be used as a stage of a pipeline.
+
+        :param item: Any iterable, including generators and cursors
+        :return: Generator of validated members, ValidationError
+        """
+        if isinstance(item, _NOT_LISTS):
+            raise ValidationError("is not a list")
+        try:
+            length = len(item)
+        except TypeError:
+            length = None
+        else:
+            self.validate_length(length)
+        if length is None and self._max_items is not None:
+            item = itertools.islice(item, self._max_items + 1)
+        check = self._validator.validate
+        seen = _Seen() if self._unique else None
+        state = _pass.get()
+        pos = -1
+        for pos, value in enumerate(item):
+            try:
+                if state is not None:
+                    state.tick()
+                check(value)
+            except ValidationError as err:
+                raise type(err)("list position [{0}] {1}".format(pos, err))
+            if seen is not None:
+                first = seen.add(value, pos)
+                if first is not None:
+                    raise ValidationError("list position [{0}] duplicate of position [{1}]".format(pos, first))
+            yield value
+        if length is None:
+            if self._max_items is not None and pos >= self._max_items:
+                raise ValidationError("list has more then {0} items".format(self._max_items))
+            self.validate_length(pos + 1)
+
+    def _validate(self, item, state):
+        """ Validate all members of item
+
+        item may be any iterable except dictionaries, sets and strings, members
+        are validated as they are produced. The number of members is checked before any member, if item has a length.
+        With sample, only the sampled_positions of sequences are checked.
+
+        :return: None, ValidationError
+        """
+        if isinstance(item, _NOT_LISTS):
+            raise ValidationError("is not a list")
+        positions = self._sampled(item)
+        if positions is not None:
+            self._validate_positions(item, positions, state)
+            return
+        if self._min_items is not None or self._max_items is not None or self._unique:
+            for _ in self.iter_validate(item):
+                pass
+            return
+        check = self._validator.validate
+        for pos, value in enumerate(item):
+            try:
+                if state is not None:
+                    state.tick()
+                check(value)
+            except ValidationError as err:
+                raise type(err)("list position [{0}] {1}".format(pos, err))
+
+    def _validate_positions(self, item, positions, state):
+        """ Validate the length of item and its members at positions
+
+        :return: None, ValidationError
+        """
+        self.validate_length(len(item))
+        check = self._validator.validate
+        for pos in positions:
+            try:
+                if state is not None:
+                    state.tick()
+                check(item[pos])
+            except ValidationError as err:
+                raise type(err)("list position [{0}] {1}".format(pos, err))
+
+    def validate_sample(self, item):
+        """ Validate item like validate, and return the positions that were checked
+
+        :return: sorted list of checked positions, or None if all members were checked, ValidationError
+        """
+        if isinstance(item, _NOT_LISTS):
+            raise ValidationError("is not a list")
+        positions = self._sampled(item)
+        if positions is None:
+            self.validate(item)
+            return None
+        self._validate_positions(item, positions, _pass.get())
+        return positions
+
+    def _validate_batch(self, item, start, stop, seen):
+        """ Validate the members of item from start to stop, used for offloaded batches
+
+        :return: None, ValidationError
         """
+        check = self._validator.validate
+        for pos in range(start, stop):
+            value = item[pos]
+            try:
+                check(value)
+            except ValidationError as err:
+                raise type(err)("list position [{0}] {1}".format(pos, err))
+            if seen is not None:
+                first = seen.add(value, pos)
+                if first is not None:
+                    raise ValidationError("list position [{0}] duplicate of position [{1}]".format(pos, first))
+
+    async def _validate_async(self, item, state):
+        """ Validate all members of item
 
         :return: None, ValidationError
         """
-        length = len(item)
-        for pos in range(length):
+        if isinstance(item, _NOT_LISTS):
+            raise ValidationError("is not a list")
+        positions = self._sampled(item)
+        if positions is not None:
+            self.validate_length(len(item))
+            for pos in positions:
+                try:
+                    await state.validate(self._validator, item[pos])
+                except ValidationError as err:
+                    raise type(err)("list position [{0}] {1}".format(pos, err))
+            return
+        try:
+            length = len(item)
+        except TypeError:
+            length = None
+        else:
+            self.validate_length(length)
+        seen = _Seen() if self._unique else None
+        size = state.offload_size
+        if size is not None and length is not None and length >= size and type(item) in (list, tuple):
+            loop = asyncio.get_running_loop()
+            for start in range(0, length, size):
+                await loop.run_in_executor(
+                    state.executor, self._validate_batch, item, start, min(start + size, length), seen
+                )
+            return
+        if length is None and self._max_items is not None:
+            item = itertools.islice(item, self._max_items + 1)
+        validator = self._validator
+        container = isinstance(validator, BaseContainer)
+        check = validator.validate
+        pos = -1
+        for pos, value in enumerate(item):
             try:
-                self.validator.validate(item[pos])
+                if container:
+                    await state.validate(validator, value)
+                else:
+                    if state.tick():
+                        await state.pause()
+                    check(value)
             except ValidationError as err:
-                raise ValidationError("list position [{0}] {1}".format(pos, err))
+                raise type(err)("list position [{0}] {1}".format(pos, err))
+            if seen is not None:
+                first = seen.add(value, pos)
+                if first is not None:
+                    raise ValidationError("list position [{0}] duplicate of position [{1}]".format(pos, first))
+        if length is None:
+            if self._max_items is not None and pos >= self._max_items:
+                raise ValidationError("list has more then {0} items".format(self._max_items))
+            self.validate_length(pos + 1)
+
+
+class _Seen(object):
+    """ Remember list members and the position they have been seen first
+
+    Members are keyed by their type and value, so 1, 1.0 and True are
+    different members, like they are for the Type Validators. Unhashable
+    dicts, lists and sets are converted to an equal hashable key, everything
+    else falls back to a linear scan.
+    """
+    __slots__ = ('_keys', '_others')
+
+    def __init__(self):
+        self._keys = {}
+        self._others = []
+
+    def add(self, value, pos):
+        """ Remember value
+
+        :return: Position value has been seen first, or None
+        """
+        try:
+            key = _hashable_key(value)
+        except TypeError:
+            for other, other_pos in self._others:
+                if type(other) is type(value) and other == value:
+                    return other_pos
+            self._others.append((value, pos))
+            return None
+        first = self._keys.setdefault(key, pos)
+        return first if first != pos else None
+
+
+def _hashable_key(value):
+    """ Hashable key that only equals the key of values with equal content and types
+
+    :return: key, TypeError for unhashable values that cannot be converted
+    """
+    kind = type(value)
+    if kind in _SCALARS:
+        return kind, value
+    if kind is dict:
+        return kind, frozenset((_hashable_key(key), _hashable_key(member)) for key, member in value.items())
+    if kind is list or kind is tuple:
+        return kind, tuple(_hashable_key(member) for member in value)
+    if kind is set or kind is frozenset:
+        return kind, frozenset(_hashable_key(member) for member in value)
+    hash(value)
+    return kind, value
 
 
 class String(Base):
@@ -305,20 +1455,40 @@ class String(Base):
 
     :param regex: Optional Regex that is used to validate the string
     """
+    __slots__ = ('_regex', '_frozen', '_source')
+
     def __init__(self, regex=None):
         self._regex = None
+        self._frozen = False
+        self._source = None
         self.regex = regex
 
+    @classmethod
+    def _deferred(cls, pattern, flags):
+        """ String whose regex is compiled on first use, for patterns known to compile
+
+        :return: String Type Validator Instance
+        """
+        validator = cls()
+        validator._source = (pattern, flags)
+        return validator
+
     @property
     def regex(self):
         """ Regex to check the string against
 
         :return: regex instance
         """
+        if self._source is not None:
+            self._regex = re.compile(*self._source)
+            self._source = None
         return self._regex
 
     @regex.setter
     def regex(self, value):
+        if self._frozen:
+            raise TypeError('String is frozen')
+        self._source = None
         if value is None:
             self._regex = None
         else:
@@ -331,15 +1501,82 @@ class String(Base):
         """
         if type(item) is not str:
             raise ValidationError('is not a string')
-        if self.regex:
-            if not self.regex.match(item):
-                raise ValidationError('string: {0} not matching pattern: {1}'.format(item, self._regex.pattern))
+        regex = self._regex
+        if regex is None:
+            if self._source is None:
+                return
+            regex = self.regex
+        if not regex.match(item):
+            raise ValidationError('string: {0} not matching pattern: {1}'.format(item, regex.pattern))
+
+    def freeze(self):
+        self._frozen = True
+        return self
+
+
+class StringDate(BaseDateTime):
+    """ Validate that string is a ISO 8601 date, like 2024-02-29
+
+    :param minval: Optional minimum datetime.date
+    :param maxval: Optional maximum datetime.date
+    """
+    __slots__ = ()
+
+    _type = datetime.date
+    _typename = 'date'
+    _parser = staticmethod(_parse_date)
+
+    def __init__(self, minval=None, maxval=None):
+        super().__init__(minval, maxval, False)
+
+
+class StringDateTime(BaseDateTime):
+    """ Validate that string is a ISO 8601 datetime
+
+    The layout is YYYY-MM-DDTHH:MM[:SS[.fff[fff]]], optionally followed by Z
+    or a UTC offset like +01:00. Bounds and values with and without a UTC
+    offset cannot be compared, so use naive or aware bounds matching the data.
+
+    :param minval: Optional minimum datetime.datetime
+    :param maxval: Optional maximum datetime.datetime
+    :param require_tz: Boolean, indicating if a UTC offset is required
+    """
+    __slots__ = ()
+
+    _type = datetime.datetime
+    _typename = 'datetime'
+    _parser = staticmethod(_parse_datetime)
+
+    def __init__(self, minval=None, maxval=None, require_tz=False):
+        super().__init__(minval, maxval, require_tz)
+
+
+class StringTime(BaseDateTime):
+    """ Validate that string is a ISO 8601 time
+
+    The layout is HH:MM[:SS[.fff[fff]]], optionally followed by Z or a UTC
+    offset like +01:00.
+
+    :param minval: Optional minimum datetime.time
+    :param maxval: Optional maximum datetime.time
+    :param require_tz: Boolean, indicating if a UTC offset is required
+    """
+    __slots__ = ()
+
+    _type = datetime.time
+    _typename = 'time'
+    _parser = staticmethod(_parse_time)
+
+    def __init__(self, minval=None, maxval=None, require_tz=False):
+        super().__init__(minval, maxval, require_tz)
 
 
-class StringUUID(Base):
+class StringUUID(BaseSingleton):
     """ Validate that string is a valid UUID
 
     """
+    __slots__ = ()
+
     def validate(self, item):
         """ Validate UUID
 
@@ -351,12 +1588,17 @@ class StringUUID(Base):
             raise ValidationError("{0} is not a uuid".format(item))
 
 
-class Tuple(Base):
+class Tuple(BaseContainer):
     """ Check fixes size list/tuple against different Type Validators
 
     """
+    __slots__ = ('_elements', '_checks')
+
     def __init__(self):
         self._elements = []
+        self._frozen = False
+        self._content = None
+        self._paths = None
 
     @property
     def elements(self):
@@ -371,19 +1613,118 @@ class Tuple(Base):
 
         :param validator: Type Validator Instance
         """
+        if self._frozen:
+            raise TypeError('Tuple is frozen')
         self._elements.append(validator)
 
-    def validate(self, item):
+    def freeze(self):
+        if not self._frozen:
+            self._frozen = True
+            self._elements = tuple(self._elements)
+            for validator in self._elements:
+                validator.freeze()
+            self._checks = tuple(validator.validate for validator in self._elements)
+        return self
+
+    def _validate(self, item, state):
         """ Validate the tuple/list
 
         :return: None, ValidationError
         """
-        length = len(self.elements)
+        if self._frozen:
+            checks = self._checks
+        else:
+            checks = [validator.validate for validator in self._elements]
+        length = len(checks)
         len_item = len(item)
         if length != len_item:
             raise ValidationError("unexpected length, expected {0} but is {1}".format(length, len_item))
         for element in range(length):
             try:
-                self.elements[element].validate(item[element])
+                if state is not None:
+                    state.tick()
+                checks[element](item[element])
             except ValidationError as err:
-                raise ValidationError("[{0}]{1}".format(element, err))
+                raise type(err)("[{0}]{1}".format(element, err))
+
+    async def _validate_async(self, item, state):
+        """ Validate the tuple/list
+
+        :return: None, ValidationError
+        """
+        length = len(self._elements)
+        len_item = len(item)
+        if length != len_item:
+            raise ValidationError("unexpected length, expected {0} but is {1}".format(length, len_item))
+        for element, validator in enumerate(self._elements):
+            try:
+                await state.validate(validator, item[element])
+            except ValidationError as err:
+                raise type(err)("[{0}]{1}".format(element, err))
+
+
+def merge_patch(target, patch):
+    """ Apply a JSON merge patch (RFC 7386)
+
+    target is not modified.
+
+    :param target: Document to patch
+    :param patch: Merge patch, None values remove members
+    :return: Patched document
+    """
+    if type(patch) is not dict:
+        return patch
+    if type(target) is not dict:
+        target = {}
+    result = dict(target)
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = merge_patch(result.get(key), value)
+    return result
+
+
+def _resolve_path(validator, path):
+    """ Resolve a JSON pointer against a validator tree
+
+    :return: tuple of steps as (kind, key, container validator), and the validator at path
+    """
+    if path == '':
+        return (), validator
+    if not path.startswith('/'):
+        raise ValueError('path {0} is not a JSON pointer'.format(path))
+    steps = []
+    for token in path[1:].split('/'):
+        token = token.replace('~1', '/').replace('~0', '~')
+        if isinstance(validator, Dict):
+            member = validator.required.get(token)
+            kind = 'required'
+            if member is None:
+                member = validator.optional.get(token)
+                kind = 'optional'
+            if member is None:
+                member = validator.pattern_validator(token)
+                kind = 'pattern'
+            if member is None:
+                raise ValueError('path {0}: {1} is not a member'.format(path, token))
+            steps.append((kind, token, validator))
+            validator = member
+        elif isinstance(validator, (List, Tuple)):
+            if not token.isdigit():
+                raise ValueError('path {0}: {1} is not a list position'.format(path, token))
+            pos = int(token)
+            if isinstance(validator, List):
+                steps.append(('list', pos, validator))
+                validator = validator.validator
+            else:
+                if pos >= len(validator.elements):
+                    raise ValueError('path {0}: {1} is beyond the tuple elements'.format(path, token))
+                steps.append(('tuple', pos, validator))
+                validator = validator.elements[pos]
+        else:
+            raise ValueError('path {0}: {1} is below a {2}'.format(path, token, type(validator).__name__))
+    return tuple(steps), validator
+
+
+from validation.proxy import lazy  # noqa: E402
@@ -0,0 +1,183 @@
+""" Validate NDJSON files from the command line
+
+    python -m validation [--workers N] [--output FILE] module:schema file.ndjson
+
+The schema is an importable Type Validator Instance, or a callable returning
+one. Every line of the file is decoded as JSON and validated, invalid lines
+are written to the output as "line: error". Throughput and latency stats are
+printed to stderr.
+
+The exit code is 0 if all lines are valid, and 1 otherwise.
+"""
+
+__author__ = 'schlitzer'
+
+import argparse
+import array
+import concurrent.futures
+import importlib
+import json
+import mmap
+import os
+import sys
+import time
+
+from validation import Base, ValidationError
+
+
+def load_schema(spec):
+    """ Import a Type Validator Instance
+
+    :param spec: "module:attribute" or "module.attribute", the attribute may be dotted
+    :return: Type Validator Instance
+    """
+    module_name, sep, attr = spec.partition(':')
+    if not sep:
+        module_name, _, attr = spec.rpartition('.')
+    if not module_name or not attr:
+        raise ValueError('schema has to be given as module:attribute')
+    schema = importlib.import_module(module_name)
+    for name in attr.split('.'):
+        schema = getattr(schema, name)
+    if not isinstance(schema, Base) and callable(schema):
+        schema = schema()
+    if not isinstance(schema, Base):
+        raise ValueError('{0} is not a Type Validator'.format(spec))
+    return schema
+
+
+def _ranges(mm, size, parts):
+    """ Split the file into byte ranges that start at the beginning of a line
+    """
+    bounds = [0]
+    for part in range(1, parts):
+        pos = mm.find(b'\n', max(size * part // parts, bounds[-1]))
+        if pos == -1:
+            break
+        bounds.append(pos + 1)
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def _validate_range(schema, path, start, end):
+    """ Validate all lines in a byte range of the file
+
+    :return: tuple of line count, invalid lines with their error relative to the range, latencies in seconds
+    """
+    if isinstance(schema, str):
+        schema = load_schema(schema).freeze()
+    check = schema.validate
+    loads = json.loads
+    clock = time.perf_counter
+    errors = []
+    latencies = array.array('d')
+    lines = 0
+    with open(path, 'rb') as handle:
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = start
+            while pos < end:
+                eol = mm.find(b'\n', pos, end)
+                if eol == -1:
+                    eol = end
+                line = mm[pos:eol]
+                pos = eol + 1
+                lines += 1
+                if not line.strip():
+                    continue
+                begin = clock()
+                try:
+                    item = loads(line)
+                except ValueError as err:
+                    errors.append((lines, 'invalid json: {0}'.format(err)))
+                else:
+                    try:
+                        check(item)
+                    except ValidationError as err:
+                        errors.append((lines, str(err)))
+                    except Exception as err:
+                        errors.append((lines, '{0}: {1}'.format(type(err).__name__, err)))
+                latencies.append(clock() - begin)
+    return lines, errors, latencies
+
+
+def validate_file(schema, path, workers=1):
+    """ Validate a NDJSON file
+
+    :param schema: Type Validator Instance, or "module:attribute" spec, required if workers > 1
+    :param path: Path to the NDJSON file
+    :param workers: Number of worker processes
+    :return: tuple of invalid lines as (line number, error) and latencies in seconds
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return [], array.array('d')
+    if workers > 1 and not isinstance(schema, str):
+        raise ValueError('schema has to be given as spec when using workers')
+    with open(path, 'rb') as handle:
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            ranges = _ranges(mm, size, workers)
+    if workers > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(
+                _validate_range, [schema] * len(ranges), [path] * len(ranges),
+                [start for start, _ in ranges], [end for _, end in ranges]
+            ))
+    else:
+        results = [_validate_range(schema, path, start, end) for start, end in ranges]
+    errors = []
+    latencies = array.array('d')
+    offset = 0
+    for lines, range_errors, range_latencies in results:
+        errors.extend((offset + line, error) for line, error in range_errors)
+        latencies.extend(range_latencies)
+        offset += lines
+    return errors, latencies
+
+
+def _percentile(values, fraction):
+    return values[int(fraction * (len(values) - 1))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m validation', description='Validate NDJSON files')
+    parser.add_argument('schema', help='Type Validator to use, as module:attribute')
+    parser.add_argument('path', help='NDJSON file to validate')
+    parser.add_argument('-w', '--workers', type=int, default=1, help='number of worker processes')
+    parser.add_argument('-o', '--output', default='-', help='file invalid lines are written to, defaults to stdout')
+    args = parser.parse_args(argv)
+
+    try:
+        schema = load_schema(args.schema).freeze()
+    except (ImportError, AttributeError, ValueError) as err:
+        parser.error('cannot load schema {0}: {1}'.format(args.schema, err))
+    if args.workers > 1:
+        schema = args.schema
+
+    start = time.perf_counter()
+    errors, latencies = validate_file(schema, args.path, workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        for line, error in errors:
+            output.write('{0}: {1}\n'.format(line, error))
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    documents = len(latencies)
+    megabytes = os.path.getsize(args.path) / 1000000
+    latencies = sorted(latencies)
+    sys.stderr.write('documents: {0} invalid: {1}\n'.format(documents, len(errors)))
+    sys.stderr.write('elapsed: {0:.3f}s\n'.format(elapsed))
+    if elapsed > 0:
+        sys.stderr.write('throughput: {0:.0f} docs/s {1:.2f} MB/s\n'.format(documents / elapsed, megabytes / elapsed))
+    if latencies:
+        sys.stderr.write('latency: p50 {0:.1f}us p99 {1:.1f}us\n'.format(
+            _percentile(latencies, 0.5) * 1000000, _percentile(latencies, 0.99) * 1000000
+        ))
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,382 @@
+""" Persistent on-disk cache of validator trees
+
+Validator trees are stored as JSON specs, so loading a cached tree never
+executes code from the cache directory. Every cache file records the format
+and library version it was written with, entries written by another version
+are rebuilt.
+
+    user_validator = cache.cached(build_user_validator, key=SCHEMA_VERSION)
+
+Workers calling cached() with the same builder and key load the stored tree
+instead of running the builder again. The key has to change whenever the tree
+changes, see builder_key. Loading skips the work of the builder, and the
+regexes of String Type Validators, which were checked when the entry was
+stored, are compiled on first use instead of while loading. For trees with
+thousands of String regexes that is what makes loading faster than building,
+see benchmarks/cache.py.
+"""
+
+__author__ = 'schlitzer'
+
+import functools
+import hashlib
+import json
+import marshal
+import os
+import re
+import tempfile
+from datetime import date, datetime, time
+
+import validation
+
+FORMAT = 1
+
+# Type Validators without parameters
+_LEAVES = ('Bool', 'IP', 'IPPort', 'IPv4', 'IPv4Port', 'IPv6', 'IPv6Port', 'StringUUID')
+
+# ISO 8601 Type Validators and the type of their bounds
+_TEMPORAL = {'StringDate': date, 'StringDateTime': datetime, 'StringTime': time}
+
+
+def _json_value(value, name):
+    if json.loads(json.dumps(value)) != value:
+        raise ValueError('{0} cannot be stored as JSON'.format(name))
+    return value
+
+
+def to_spec(validator):
+    """ Convert a validator tree to a JSON compatible spec
+
+    :param validator: Type Validator Instance
+    :return: dict, ValueError if the tree contains unsupported Type Validators or cycles
+    """
+    return _to_spec(validator, set())
+
+
+def _to_spec(validator, parents):
+    if validator is None:
+        return None
+    if id(validator) in parents:
+        raise ValueError('recursive validator trees cannot be cached')
+    name = type(validator).__name__
+    if getattr(validation, name, None) is not type(validator):
+        raise ValueError('{0} cannot be cached'.format(name))
+    parents = parents | {id(validator)}
+    if name in _LEAVES:
+        return {'type': name}
+    if name in ('Float', 'Int'):
+        return {'type': name, 'minval': validator._minval, 'maxval': validator._maxval}
+    if name == 'Choice':
+        return {'type': name, 'choices': _json_value(list(validator._choices), 'choices')}
+    if name == 'String':
+        if validator._source is not None:
+            pattern, flags = validator._source
+            return {'type': name, 'regex': pattern, 'flags': flags}
+        regex = validator.regex
+        if regex is None:
+            return {'type': name, 'regex': None}
+        return {'type': name, 'regex': regex.pattern, 'flags': regex.flags}
+    if name in _TEMPORAL:
+        spec = {
+            'type': name,
+            'minval': None if validator.minval is None else validator.minval.isoformat(),
+            'maxval': None if validator.maxval is None else validator.maxval.isoformat(),
+        }
+        if name != 'StringDate':
+            spec['require_tz'] = validator.require_tz
+        return spec
+    if name == 'List':
+        return {
+            'type': name,
+            'validator': _to_spec(validator.validator, parents),
+            'min_items': validator.min_items,
+            'max_items': validator.max_items,
+            'unique': validator.unique,
+            'sample': validator.sample,
+            'sample_edges': validator.sample_edges,
+            'sample_seed': _json_value(validator.sample_seed, 'sample_seed'),
+        }
+    if name == 'Tuple':
+        return {'type': name, 'elements': [_to_spec(element, parents) for element in validator.elements]}
+    if name == 'Dict':
+        return {
+            'type': name,
+            'ignore_unknown': validator._ignore,
+            'adaptive': validator._adaptive is not None,
+            'required': [[_json_value(key, 'key'), _to_spec(member, parents)] for key, member in validator.required.items()],
+            'optional': [[_json_value(key, 'key'), _to_spec(member, parents)] for key, member in validator.optional.items()],
+            'patterns': [[pattern, _to_spec(member, parents)] for pattern, member in validator.patterns.items()],
+        }
+    raise ValueError('{0} cannot be cached'.format(name))
+
+
+def from_spec(spec):
+    """ Build a validator tree from a spec created by to_spec
+
+    :param spec: dict
+    :return: Type Validator Instance, ValueError for unknown specs
+    """
+    if spec is None:
+        return None
+    name = spec['type']
+    if name in _LEAVES:
+        return getattr(validation, name)()
+    if name in ('Float', 'Int'):
+        return getattr(validation, name)(minval=spec['minval'], maxval=spec['maxval'])
+    if name == 'Choice':
+        return validation.Choice(choices=spec['choices'])
+    if name == 'String':
+        if spec['regex'] is None:
+            return validation.String()
+        return validation.String._deferred(spec['regex'], spec['flags'])
+    if name in _TEMPORAL:
+        parse = _TEMPORAL[name].fromisoformat
+        kwargs = {
+            'minval': None if spec['minval'] is None else parse(spec['minval']),
+            'maxval': None if spec['maxval'] is None else parse(spec['maxval']),
+        }
+        if name != 'StringDate':
+            kwargs['require_tz'] = spec['require_tz']
+        return getattr(validation, name)(**kwargs)
+    if name == 'List':
+        return validation.List(
+            from_spec(spec['validator']),
+            min_items=spec['min_items'], max_items=spec['max_items'], unique=spec['unique'],
+            sample=spec['sample'], sample_edges=spec['sample_edges'], sample_seed=spec['sample_seed']
+        )
+    if name == 'Tuple':
+        validator = validation.Tuple()
+        for element in spec['elements']:
+            validator.add_element(from_spec(element))
+        return validator
+    if name == 'Dict':
+        validator = validation.Dict(ignore_unknown=spec['ignore_unknown'], adaptive=spec['adaptive'])
+        for key, member in spec['required']:
+            validator.required[key] = from_spec(member)
+        for key, member in spec['optional']:
+            validator.optional[key] = from_spec(member)
+        for pattern, member in spec['patterns']:
+            validator.patterns[pattern] = from_spec(member)
+        return validator
+    raise ValueError('unknown validator type {0}'.format(name))
+
+
+def _dumps(spec):
+    return json.dumps(spec, separators=(',', ':'))
+
+
+def fingerprint(validator):
+    """ Stable fingerprint of a validator tree
+
+    The fingerprint changes with the structure and parameters of the tree, the
+    order of Dict members, and the library version.
+
+    :param validator: Type Validator Instance
+    :return: hex string
+    """
+    return _fingerprint(to_spec(validator))
+
+
+def _fingerprint(spec):
+    digest = hashlib.sha256()
+    digest.update('{0}:{1}:'.format(FORMAT, validation.__version__).encode())
+    digest.update(_dumps(spec).encode())
+    return digest.hexdigest()
+
+
+def default_directory():
+    """ Cache directory used if none is given
+
+    :return: $VALIDATION_CACHE_DIR, or ~/.cache/validation
+    """
+    directory = os.environ.get('VALIDATION_CACHE_DIR')
+    if directory:
+        return directory
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'validation')
+
+
+class SchemaCache(object):
+    """ Store validator trees as JSON files
+
+    :param directory: Optional cache directory, defaults to default_directory()
+    """
+    __slots__ = ('_directory',)
+
+    def __init__(self, directory=None):
+        self._directory = directory or default_directory()
+
+    @property
+    def directory(self):
+        """ Directory holding the cache files
+
+        :return: str
+        """
+        return self._directory
+
+    def _path(self, key):
+        return os.path.join(self._directory, '{0}.json'.format(key))
+
+    def load(self, key, expected=None):
+        """ Load a validator tree
+
+        Entries are valid if they were written for key by this format and
+        library version, and their spec still matches the fingerprint stored
+        with it. If expected is given, the spec also has to match it, which
+        rejects entries that are intact but were built by another builder.
+
+        :param key: Cache key
+        :param expected: Optional fingerprint of the validator tree the entry has to hold
+        :return: Type Validator Instance, or None if there is no valid entry
+        """
+        try:
+            with open(self._path(key)) as handle:
+                entry = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if type(entry) is not dict:
+            return None
+        if entry.get('format') != FORMAT or entry.get('version') != validation.__version__:
+            return None
+        if entry.get('key') != key:
+            return None
+        spec = entry.get('spec')
+        if entry.get('fingerprint') != _fingerprint(spec):
+            return None
+        if expected is not None and entry['fingerprint'] != expected:
+            return None
+        try:
+            return from_spec(spec)
+        except (KeyError, TypeError, ValueError, re.error):
+            return None
+
+    def store(self, key, validator):
+        """ Store a validator tree
+
+        The file is written atomically, concurrent writers do not corrupt the entry.
+
+        :param key: Cache key
+        :param validator: Type Validator Instance
+        :return: Fingerprint of the validator tree
+        """
+        spec = to_spec(validator)
+        entry = {
+            'format': FORMAT,
+            'version': validation.__version__,
+            'key': key,
+            'fingerprint': _fingerprint(spec),
+            'spec': spec,
+        }
+        os.makedirs(self._directory, exist_ok=True)
+        handle, tmp = tempfile.mkstemp(dir=self._directory, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'w') as tmp_file:
+                tmp_file.write(_dumps(entry))
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            os.remove(tmp)
+            raise
+        return entry['fingerprint']
+
+    def get(self, builder, key, verify=False):
+        """ Load the validator tree built by builder, or build and store it
+
+        :param builder: Callable without arguments returning a Type Validator Instance
+        :param key: JSON compatible version of everything the builder depends on, see builder_key
+        :param verify: Boolean, run the builder anyway and replace the entry if it holds another tree,
+            for tests of builders that read globals
+        :return: Type Validator Instance
+        """
+        cache_key = builder_key(builder, key)
+        if verify:
+            validator = builder()
+            expected = fingerprint(validator)
+            if self.load(cache_key, expected=expected) is None:
+                self.store(cache_key, validator)
+            return validator
+        validator = self.load(cache_key)
+        if validator is None:
+            validator = builder()
+            self.store(cache_key, validator)
+        return validator
+
+
+def _builder_value(value, parents):
+    if isinstance(value, validation.Base):
+        try:
+            return to_spec(value)
+        except ValueError:
+            return None
+    if isinstance(value, functools.partial) or hasattr(value, '__code__'):
+        digest = hashlib.sha256()
+        _digest_builder(digest, value, parents)
+        return digest.hexdigest()
+    try:
+        return _json_value(value, 'value')
+    except (TypeError, ValueError):
+        return None
+
+
+def _digest_builder(digest, builder, parents):
+    """ Feed the code of builder, its defaults and the values its closure captures into digest
+
+    Values that are neither JSON compatible nor Type Validators are skipped.
+
+    :param parents: ids of the functions that are being digested, to stop at recursive closures
+    """
+    if id(builder) in parents:
+        return
+    parents = parents | {id(builder)}
+    if isinstance(builder, functools.partial):
+        _digest_builder(digest, builder.func, parents)
+        digest.update(_dumps([
+            [_builder_value(arg, parents) for arg in builder.args],
+            [[name, _builder_value(arg, parents)] for name, arg in sorted(builder.keywords.items())],
+        ]).encode())
+        return
+    code = getattr(builder, '__code__', None)
+    if code is None:
+        return
+    digest.update(marshal.dumps(code))
+    digest.update(_dumps([
+        [_builder_value(value, parents) for value in builder.__defaults__ or ()],
+        [[name, _builder_value(value, parents)] for name, value in sorted((builder.__kwdefaults__ or {}).items())],
+        [_builder_value(cell.cell_contents, parents) for cell in builder.__closure__ or ()],
+    ]).encode())
+
+
+def builder_key(builder, key):
+    """ Cache key of a builder
+
+    key has to change whenever the tree the builder returns changes, like a
+    release number or a hash of the files a schema is generated from. The code
+    of the builder, its default arguments and the values its closure captures
+    are added, so editing the builder itself also invalidates its entries, but
+    functions and globals it calls are not, they are covered by key only.
+
+    :param builder: Callable without arguments returning a Type Validator Instance
+    :param key: JSON compatible version of everything the builder depends on
+    :return: str, ValueError if key is None
+    """
+    if key is None:
+        raise ValueError('key is required, pass a version of everything the builder depends on')
+    digest = hashlib.sha256()
+    _digest_builder(digest, builder, frozenset())
+    digest.update(_dumps(key).encode())
+    func = builder
+    while isinstance(func, functools.partial):
+        func = func.func
+    name = '{0}.{1}'.format(getattr(func, '__module__', None), getattr(func, '__qualname__', type(func).__qualname__))
+    return '{0}-{1}'.format(re.sub(r'[^A-Za-z0-9_.-]', '_', name), digest.hexdigest()[:32])
+
+
+def cached(builder, key, directory=None, verify=False):
+    """ Load the validator tree built by builder from the cache, or build and store it
+
+    :param builder: Callable without arguments returning a Type Validator Instance
+    :param key: JSON compatible version of everything the builder depends on, see builder_key
+    :param directory: Optional cache directory, defaults to default_directory()
+    :param verify: Boolean, run the builder anyway and replace the entry if it holds another tree
+    :return: Type Validator Instance
+    """
+    return SchemaCache(directory).get(builder, key, verify=verify)
@@ -0,0 +1,184 @@
+""" Validate column oriented record batches against a Dict Type Validator
+
+A batch maps member names to columns of equal length. A column can be a
+list, a tuple, an array.array, any array type with a numpy style dtype, or an
+Arrow style array. Every member validator is applied to its whole column at
+once, rows are never materialized as dictionaries.
+
+Arrow style arrays have no numpy dtype and iterate over Arrow scalars, which
+no Type Validator accepts. They are recognized by their to_pylist method:
+number columns are viewed through to_numpy(zero_copy_only=True) when the
+buffer allows it, all other columns, and number columns with nulls, are
+converted with to_pylist.
+
+Int, Float, Choice and String have column level fast paths, all other
+Type Validators are applied member by member.
+"""
+
+__author__ = 'schlitzer'
+
+from validation import BaseNumber, Choice, Dict, String, ValidationError
+
+# numpy dtype kinds that only hold values of the given python type
+_KINDS = {int: 'iu', float: 'f'}
+
+
+def _scan(validator, column):
+    errors = []
+    check = validator.validate
+    for row, value in enumerate(column):
+        try:
+            check(value)
+        except ValidationError as err:
+            errors.append((row, str(err)))
+    return errors
+
+
+def _number_errors(validator, column):
+    typenum = validator._typenum
+    minval = validator._minval
+    maxval = validator._maxval
+    dtype = getattr(column, 'dtype', None)
+    if dtype is not None:
+        if dtype.kind not in _KINDS[typenum]:
+            return _scan(validator, column)
+        mask = None
+        if minval is not None:
+            mask = column < minval
+        if maxval is not None:
+            mask = column > maxval if mask is None else mask | (column > maxval)
+        if mask is None:
+            return []
+        errors = []
+        for row in mask.nonzero()[0]:
+            try:
+                validator.validate(column[row].item())
+            except ValidationError as err:
+                errors.append((int(row), str(err)))
+        return errors
+    if not all(type(value) is typenum for value in column):
+        return _scan(validator, column)
+    if len(column) == 0:
+        return []
+    low = min(column)
+    high = max(column)
+    # NaN makes min and max depend on the order of values
+    if low != low or high != high:
+        return _scan(validator, column)
+    if minval is not None and low < minval:
+        return _scan(validator, column)
+    if maxval is not None and high > maxval:
+        return _scan(validator, column)
+    return []
+
+
+def _choice_errors(validator, column):
+    try:
+        if set(column) <= frozenset(validator._choices):
+            return []
+    except TypeError:
+        pass
+    return _scan(validator, column)
+
+
+def _string_errors(validator, column):
+    if not all(type(value) is str for value in column):
+        return _scan(validator, column)
+    regex = validator.regex
+    if regex and not all(map(regex.match, column)):
+        return _scan(validator, column)
+    return []
+
+
+def _values(validator, column):
+    if getattr(column, 'dtype', None) is not None or not hasattr(column, 'to_pylist'):
+        return column
+    if isinstance(validator, BaseNumber) and hasattr(column, 'to_numpy'):
+        try:
+            return column.to_numpy(zero_copy_only=True)
+        except (TypeError, ValueError):
+            # nulls, chunks or a type without a numpy buffer
+            pass
+    return column.to_pylist()
+
+
+def column_errors(validator, column):
+    """ Validate a single column against a Type Validator
+
+    :param validator: Type Validator Instance
+    :param column: Sequence of values
+    :return: list of (row, message) tuples, ordered by row
+    """
+    column = _values(validator, column)
+    if isinstance(validator, BaseNumber):
+        return _number_errors(validator, column)
+    if isinstance(validator, Choice):
+        return _choice_errors(validator, column)
+    if isinstance(validator, String):
+        return _string_errors(validator, column)
+    return _scan(validator, column)
+
+
+def _rows(columns):
+    rows = None
+    for name, column in columns.items():
+        length = len(column)
+        if rows is None:
+            rows = length
+        elif rows != length:
+            raise ValidationError("column {0} has {1} rows, expected {2}".format(name, length, rows))
+    return rows or 0
+
+
+def failing_rows(validator, columns):
+    """ Validate a column oriented batch and collect all failing rows
+
+    Every failing row is reported once, with the message Dict.validate would
+    raise for that row.
+
+    :param validator: Dict Type Validator Instance
+    :param columns: Mapping of member names to columns of equal length
+    :return: list of (row, message) tuples, ordered by row, ValidationError if the columns differ in length
+    """
+    if not isinstance(validator, Dict):
+        raise ValueError('validator is not a Dict')
+    rows = _rows(columns)
+    errors = {}
+    for key, member in validator.required.items():
+        if key not in columns:
+            for row in range(rows):
+                errors.setdefault(row, "required member {0} missing".format(key))
+            continue
+        for row, message in column_errors(member, columns[key]):
+            errors.setdefault(row, "required member {0} {1}".format(key, message))
+    for key, member in validator.optional.items():
+        if key not in columns:
+            continue
+        for row, message in column_errors(member, columns[key]):
+            errors.setdefault(row, "optional member {0} {1}".format(key, message))
+    unknown = columns.keys() - validator.required.keys() - validator.optional.keys()
+    for key in [key for key in columns if key in unknown]:
+        member = validator.pattern_validator(key)
+        if member is None:
+            continue
+        unknown.discard(key)
+        for row, message in column_errors(member, columns[key]):
+            errors.setdefault(row, "pattern member {0} {1}".format(key, message))
+    if not validator._ignore:
+        if unknown:
+            for row in range(rows):
+                errors.setdefault(row, "got unknown members: {0}".format(unknown))
+    return sorted(errors.items())
+
+
+def validate_columns(validator, columns):
+    """ Validate a column oriented batch
+
+    :param validator: Dict Type Validator Instance
+    :param columns: Mapping of member names to columns of equal length
+    :return: None, ValidationError for the first failing row
+    """
+    errors = failing_rows(validator, columns)
+    if errors:
+        row, message = errors[0]
+        raise ValidationError("row [{0}] {1}".format(row, message))
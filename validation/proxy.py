@@ -0,0 +1,221 @@
+""" Lazy validating proxies
+
+lazy() wraps an item in a read only proxy that validates Dict members, List
+members and Tuple elements the first time they are accessed. Nested
+containers are wrapped in proxies themselves. Errors are the ValidationErrors
+the Type Validator would raise, including the path of the accessed member.
+validate_rest() validates everything that has not been accessed yet.
+"""
+
+__author__ = 'schlitzer'
+
+from collections.abc import Mapping, Sequence
+
+from validation import Dict, List, Tuple, ValidationError, _Seen
+
+
+def lazy(validator, item):
+    """ Wrap item in a proxy that validates members on first access
+
+    Dict, List and Tuple Type Validators return a proxy, all other Type
+    Validators validate item right away and return it.
+
+    :param validator: Type Validator Instance
+    :param item: Item to validate
+    :return: Proxy or item, ValidationError
+    """
+    return _lazy(validator, item, '')
+
+
+def _lazy(validator, item, prefix):
+    if isinstance(validator, Dict):
+        return LazyDict(validator, item, prefix)
+    if isinstance(validator, List):
+        return LazyList(validator, item, prefix)
+    if isinstance(validator, Tuple):
+        return LazyTuple(validator, item, prefix)
+    try:
+        validator.validate(item)
+    except ValidationError as err:
+        raise type(err)("{0}{1}".format(prefix, err))
+    return item
+
+
+def _validate_rest(value):
+    if isinstance(value, _LazyBase):
+        value.validate_rest()
+
+
+class _LazyBase(object):
+    __slots__ = ('_validator', '_item', '_prefix', '_cache', '_done')
+
+    def __init__(self, validator, item, prefix):
+        self._validator = validator
+        self._item = item
+        self._prefix = prefix
+        self._cache = {}
+        self._done = False
+
+    def _error(self, message):
+        return ValidationError("{0}{1}".format(self._prefix, message))
+
+    def _member(self, key, validator, value, prefix):
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        value = _lazy(validator, value, self._prefix + prefix)
+        self._cache[key] = value
+        return value
+
+    def __repr__(self):
+        return '{0}({1!r})'.format(type(self).__name__, self._item)
+
+
+class LazyDict(_LazyBase, Mapping):
+    """ Read only mapping validating members on first access
+    """
+    __slots__ = ()
+
+    def __init__(self, validator, item, prefix=''):
+        super().__init__(validator, item, prefix)
+        if type(item) is not dict:
+            raise self._error("is not a dictionary")
+
+    def __getitem__(self, key):
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        validator = self._validator.required.get(key)
+        kind = 'required'
+        if validator is None:
+            validator = self._validator.optional.get(key)
+            kind = 'optional'
+        if validator is None:
+            validator = self._validator.pattern_validator(key)
+            kind = 'pattern'
+        if key not in self._item:
+            if validator is not None and kind == 'required':
+                raise self._error("required member {0} missing".format(key))
+            raise KeyError(key)
+        if validator is None:
+            if not self._validator._ignore:
+                raise self._error("got unknown members: {0}".format({key}))
+            return self._item[key]
+        return self._member(key, validator, self._item[key], "{0} member {1} ".format(kind, key))
+
+    def __contains__(self, key):
+        return key in self._item
+
+    def __iter__(self):
+        return iter(self._item)
+
+    def __len__(self):
+        return len(self._item)
+
+    def validate_rest(self):
+        """ Validate all members that have not been accessed yet
+
+        :return: None, ValidationError
+        """
+        if self._done:
+            return
+        for key in self._validator.required:
+            _validate_rest(self[key])
+        for key in self._validator.optional:
+            if key in self._item:
+                _validate_rest(self[key])
+        keys = self._item.keys() - self._validator.required.keys() - self._validator.optional.keys()
+        if self._validator.patterns:
+            for key in [key for key in self._item if key in keys]:
+                if self._validator.pattern_validator(key) is not None:
+                    _validate_rest(self[key])
+                    keys.discard(key)
+        if not self._validator._ignore and len(keys) > 0:
+            raise self._error("got unknown members: {0}".format(keys))
+        self._done = True
+
+
+class _LazySequence(_LazyBase, Sequence):
+    __slots__ = ()
+
+    def _validator_at(self, pos):
+        raise NotImplementedError
+
+    def _prefix_at(self, pos):
+        raise NotImplementedError
+
+    def _validate_sequence(self):
+        pass
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[pos] for pos in range(*index.indices(len(self._item)))]
+        pos = index
+        if pos < 0:
+            pos += len(self._item)
+        if not 0 <= pos < len(self._item):
+            raise IndexError('index out of range')
+        return self._member(pos, self._validator_at(pos), self._item[pos], self._prefix_at(pos))
+
+    def __len__(self):
+        return len(self._item)
+
+    def validate_rest(self):
+        """ Validate all members that have not been accessed yet
+
+        :return: None, ValidationError
+        """
+        if self._done:
+            return
+        for pos in range(len(self._item)):
+            _validate_rest(self[pos])
+        self._validate_sequence()
+        self._done = True
+
+
+class LazyList(_LazySequence):
+    """ Read only sequence validating list members on first access
+    """
+    __slots__ = ()
+
+    def __init__(self, validator, item, prefix=''):
+        super().__init__(validator, item, prefix)
+        try:
+            validator.validate_length(len(item))
+        except ValidationError as err:
+            raise self._error(err)
+
+    def _validator_at(self, pos):
+        return self._validator.validator
+
+    def _prefix_at(self, pos):
+        return "list position [{0}] ".format(pos)
+
+    def _validate_sequence(self):
+        if self._validator.unique:
+            seen = _Seen()
+            for pos, value in enumerate(self._item):
+                first = seen.add(value, pos)
+                if first is not None:
+                    raise self._error("list position [{0}] duplicate of position [{1}]".format(pos, first))
+
+
+class LazyTuple(_LazySequence):
+    """ Read only sequence validating tuple elements on first access
+    """
+    __slots__ = ()
+
+    def __init__(self, validator, item, prefix=''):
+        super().__init__(validator, item, prefix)
+        length = len(validator.elements)
+        len_item = len(item)
+        if length != len_item:
+            raise self._error("unexpected length, expected {0} but is {1}".format(length, len_item))
+
+    def _validator_at(self, pos):
+        return self._validator.elements[pos]
+
+    def _prefix_at(self, pos):
+        return "[{0}]".format(pos)
@@ -0,0 +1,205 @@
+""" Validate large numeric arrays on multiple processes using shared memory
+
+    shared.validate_array(validation.List(validation.Int(minval=0, maxval=255)), samples)
+
+The array is copied into a multiprocessing.shared_memory block once, worker
+processes attach to the block and range check disjoint slices without
+copying or pickling the data. Arrays that are already backed by a shared
+memory block can be validated in place with validate_shared().
+
+Supported are one dimensional arrays of the native typecodes bBhHiIlLqQfd,
+like array.array or numpy arrays, against List Type Validators of Int or
+Float, and Tuple Type Validators whose elements are Int or Float. Other
+Type Validators fall back to the sequential validate.
+
+Slices are collected in order, so the reported error is the one for the
+lowest failing index, the same one List.validate or Tuple.validate would raise.
+"""
+
+__author__ = 'schlitzer'
+
+import concurrent.futures
+import os
+from multiprocessing import shared_memory
+
+from validation import BaseNumber, List, Tuple, ValidationError
+
+# number of array members checked per task
+CHUNKSIZE = 1 << 20
+
+_TYPECODES = {
+    'b': int, 'B': int, 'h': int, 'H': int, 'i': int, 'I': int,
+    'l': int, 'L': int, 'q': int, 'Q': int, 'f': float, 'd': float,
+}
+
+
+def _fails(value, typenum, minval, maxval):
+    if type(value) is not typenum:
+        return True
+    if minval is not None and minval > value:
+        return True
+    return maxval is not None and maxval < value
+
+
+def _scan(values, start, bounds):
+    """ Find the first failing member of values
+
+    :param values: memoryview of the slice
+    :param start: Index of the first member of the slice
+    :param bounds: (typenum, minval, maxval) for all members, or a list with one per member
+    :return: index of the first failing member, or None
+    """
+    if type(bounds) is list:
+        for pos, value in enumerate(values):
+            if _fails(value, *bounds[pos]):
+                return start + pos
+        return None
+    if len(values) == 0:
+        return None
+    typenum, minval, maxval = bounds
+    low = min(values)
+    high = max(values)
+    # NaN makes min and max depend on the order of members
+    if low == low and high == high:
+        if (minval is None or minval <= low) and (maxval is None or maxval >= high):
+            return None
+    for pos, value in enumerate(values, start):
+        if _fails(value, typenum, minval, maxval):
+            return pos
+    return None
+
+
+def _first_error(name, typecode, start, stop, bounds):
+    """ Worker task, check a slice of the array in shared memory block name
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        with shm.buf.cast(typecode) as view, view[start:stop] as values:
+            return _scan(values, start, bounds)
+    finally:
+        shm.close()
+
+
+def _run(shm, typecode, values, bounds, workers, chunksize, executor):
+    length = len(values)
+    if shm is None or length <= chunksize or (executor is None and workers < 2):
+        return _scan(values, 0, bounds)
+    if executor is None:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            return _run_chunks(pool, shm, typecode, length, bounds, chunksize)
+    return _run_chunks(executor, shm, typecode, length, bounds, chunksize)
+
+
+def _run_chunks(executor, shm, typecode, length, bounds, chunksize):
+    futures = []
+    for start in range(0, length, chunksize):
+        stop = min(start + chunksize, length)
+        chunk_bounds = bounds[start:stop] if type(bounds) is list else bounds
+        futures.append(executor.submit(_first_error, shm.name, typecode, start, stop, chunk_bounds))
+    try:
+        for future in futures:
+            pos = future.result()
+            if pos is not None:
+                return pos
+        return None
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def _number_bounds(validator):
+    if not isinstance(validator, BaseNumber):
+        return None
+    return validator._typenum, validator._minval, validator._maxval
+
+
+def _validate(validator, values, typecode, shm, workers, chunksize, executor):
+    length = len(values)
+    if isinstance(validator, List):
+        bounds = _number_bounds(validator.validator)
+        if bounds is None or validator.unique:
+            validator.validate(values)
+            return
+        validator.validate_length(length)
+        if length > 0 and _TYPECODES[typecode] is not bounds[0]:
+            pos = 0
+        else:
+            pos = _run(shm, typecode, values, bounds, workers, chunksize, executor)
+        if pos is not None:
+            try:
+                validator.validator.validate(values[pos])
+            except ValidationError as err:
+                raise type(err)("list position [{0}] {1}".format(pos, err))
+    elif isinstance(validator, Tuple):
+        bounds = [_number_bounds(element) for element in validator.elements]
+        if None in bounds:
+            validator.validate(values)
+            return
+        if len(bounds) != length:
+            raise ValidationError("unexpected length, expected {0} but is {1}".format(len(bounds), length))
+        pos = _run(shm, typecode, values, bounds, workers, chunksize, executor)
+        if pos is not None:
+            try:
+                validator.elements[pos].validate(values[pos])
+            except ValidationError as err:
+                raise type(err)("[{0}]{1}".format(pos, err))
+    else:
+        raise ValueError('validator is not a List or Tuple')
+
+
+def _typecode(typecode):
+    typecode = typecode.lstrip('@')
+    if typecode not in _TYPECODES:
+        raise ValueError('unsupported array format {0}'.format(typecode))
+    return typecode
+
+
+def validate_shared(validator, shm, typecode, length, workers=None, chunksize=CHUNKSIZE, executor=None):
+    """ Validate an array stored in a shared memory block in place
+
+    :param validator: List or Tuple Type Validator Instance
+    :param shm: multiprocessing.shared_memory.SharedMemory holding the array
+    :param typecode: array.array typecode of the members
+    :param length: Number of members
+    :param workers: Optional number of processes, defaults to the number of CPUs
+    :param chunksize: Number of members checked per task
+    :param executor: Optional concurrent.futures.ProcessPoolExecutor to use instead of a private pool
+    :return: None, ValidationError
+    """
+    typecode = _typecode(typecode)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    with shm.buf.cast(typecode) as view, view[:length] as values:
+        _validate(validator, values, typecode, shm, workers, chunksize, executor)
+
+
+def validate_array(validator, data, workers=None, chunksize=CHUNKSIZE, executor=None):
+    """ Validate a numeric array using worker processes
+
+    Arrays with more than chunksize members are copied into a shared memory
+    block once, smaller arrays are validated in this process.
+
+    :param validator: List or Tuple Type Validator Instance
+    :param data: One dimensional contiguous array, like array.array or a numpy array
+    :param workers: Optional number of processes, defaults to the number of CPUs
+    :param chunksize: Number of members checked per task
+    :param executor: Optional concurrent.futures.ProcessPoolExecutor to use instead of a private pool
+    :return: None, ValidationError
+    """
+    with memoryview(data) as view:
+        if view.ndim != 1 or not view.c_contiguous:
+            raise ValueError('array has to be one dimensional and contiguous')
+        typecode = _typecode(view.format)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if len(view) <= chunksize or (executor is None and workers < 2):
+            _validate(validator, view, typecode, None, workers, chunksize, executor)
+            return
+        shm = shared_memory.SharedMemory(create=True, size=view.nbytes)
+        try:
+            with view.cast('B') as raw:
+                shm.buf[:view.nbytes] = raw
+            validate_shared(validator, shm, typecode, len(view), workers, chunksize, executor)
+        finally:
+            shm.close()
+            shm.unlink()
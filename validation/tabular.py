@@ -0,0 +1,171 @@
+""" Validate CSV and TSV files row by row against a Tuple Type Validator
+
+    with open('export.tsv', newline='') as handle:
+        for row, column, message in tabular.iter_errors(row_validator, handle, delimiter='\t'):
+            ...
+
+Every element of the Tuple describes a column. Fields are read as strings
+and converted by the type of their element before they are validated: Int,
+Float, Bool and Choice fields are converted to the matching python values,
+Dict, List and Tuple fields are decoded as JSON, all other fields are
+validated as strings. Fields that cannot be converted are validated as they
+are, so the error is the one the Type Validator raises for the string.
+Numbers with surrounding whitespace or underscores are not converted, Float
+fields accept nan, inf and exponents like python's float does.
+
+Exceptions other than ValidationError raised by a Type Validator, like the
+ValueError of IPPort for a missing port, are reported as errors of their field.
+
+Files are read with the csv module, one batch of rows at a time, so memory
+use does not depend on the size of the file. Rows are counted from 0,
+starting after the header, blank lines are skipped.
+"""
+
+__author__ = 'schlitzer'
+
+import csv
+import json
+
+from validation import BaseNumber, Bool, Choice, Dict, List, Tuple, ValidationError
+
+_BOOLS = {'true': True, 'false': False}
+
+
+def _convert_number(typenum):
+    def convert(field):
+        if '_' in field or field[:1].isspace() or field[-1:].isspace():
+            return field
+        try:
+            return typenum(field)
+        except ValueError:
+            return field
+    return convert
+
+
+def _convert_bool(field):
+    return _BOOLS.get(field.lower(), field)
+
+
+def _convert_json(field):
+    try:
+        return json.loads(field)
+    except ValueError:
+        return field
+
+
+def _convert_string(field):
+    return field
+
+
+def converter(validator):
+    """ Function converting a field for validator
+
+    :param validator: Type Validator Instance of the column
+    :return: function taking the field string and returning the converted value
+    """
+    if isinstance(validator, BaseNumber):
+        return _convert_number(validator._typenum)
+    if isinstance(validator, Bool):
+        return _convert_bool
+    if isinstance(validator, Choice):
+        choices = {str(choice): choice for choice in validator._choices}
+        return lambda field: choices.get(field, field)
+    if isinstance(validator, (Dict, List, Tuple)):
+        return _convert_json
+    return _convert_string
+
+
+def _columns(validator):
+    if not isinstance(validator, Tuple):
+        raise ValueError('validator is not a Tuple')
+    return [(converter(element), element.validate) for element in validator.elements]
+
+
+def _validate_record(columns, record, row, errors):
+    """ Convert and validate a record, failures are appended to errors as (row, column, message)
+
+    :return: list of converted values, or None if the record is invalid
+    """
+    if len(record) != len(columns):
+        errors.append((row, None, "unexpected length, expected {0} but is {1}".format(len(columns), len(record))))
+        return None
+    values = []
+    valid = True
+    for column, ((convert, check), field) in enumerate(zip(columns, record)):
+        value = convert(field)
+        try:
+            check(value)
+        except ValidationError as err:
+            errors.append((row, column, str(err)))
+            valid = False
+        except Exception as err:
+            errors.append((row, column, '{0}: {1}'.format(type(err).__name__, err)))
+            valid = False
+        values.append(value)
+    return values if valid else None
+
+
+def iter_batches(validator, fileobj, chunksize=1024, header=False, **fmtparams):
+    """ Validate a CSV file in batches of rows
+
+    :param validator: Tuple Type Validator Instance describing a row
+    :param fileobj: Text file object, opened with newline=''
+    :param chunksize: Number of rows per batch
+    :param header: Boolean, indicating if the first record is a header
+    :param fmtparams: Format parameters of csv.reader, like delimiter='\\t' for TSV
+    :return: generator of (rows, errors), rows as list of (row, converted values) of valid rows,
+        errors as list of (row, column, message), column is None if the row has the wrong length
+    """
+    columns = _columns(validator)
+    reader = csv.reader(fileobj, **fmtparams)
+    if header:
+        next(reader, None)
+    rows = []
+    errors = []
+    count = 0
+    row = 0
+    for record in reader:
+        if not record:
+            continue
+        values = _validate_record(columns, record, row, errors)
+        if values is not None:
+            rows.append((row, values))
+        row += 1
+        count += 1
+        if count == chunksize:
+            yield rows, errors
+            rows = []
+            errors = []
+            count = 0
+    if count:
+        yield rows, errors
+
+
+def iter_errors(validator, fileobj, chunksize=1024, header=False, **fmtparams):
+    """ Validate a CSV file and yield every failing field
+
+    :param validator: Tuple Type Validator Instance describing a row
+    :param fileobj: Text file object, opened with newline=''
+    :param chunksize: Number of rows read per batch
+    :param header: Boolean, indicating if the first record is a header
+    :param fmtparams: Format parameters of csv.reader, like delimiter='\\t' for TSV
+    :return: generator of (row, column, message), column is None if the row has the wrong length
+    """
+    for _, errors in iter_batches(validator, fileobj, chunksize=chunksize, header=header, **fmtparams):
+        yield from errors
+
+
+def validate_file(validator, fileobj, chunksize=1024, header=False, **fmtparams):
+    """ Validate a CSV file
+
+    :param validator: Tuple Type Validator Instance describing a row
+    :param fileobj: Text file object, opened with newline=''
+    :param chunksize: Number of rows read per batch
+    :param header: Boolean, indicating if the first record is a header
+    :param fmtparams: Format parameters of csv.reader, like delimiter='\\t' for TSV
+    :return: None, ValidationError for the first failing field
+    """
+    for row, column, message in iter_errors(validator, fileobj, chunksize=chunksize, header=header, **fmtparams):
+        if column is None:
+            raise ValidationError("row [{0}] {1}".format(row, message))
+        raise ValidationError("row [{0}] [{1}]{2}".format(row, column, message))
@@ -0,0 +1,104 @@
+""" Validate large lists on multiple threads
+
+Threads only help on free-threaded (no-GIL) CPython builds. When the GIL is
+enabled, validation falls back to the sequential List.validate, so callers
+can use these functions unconditionally.
+
+The list is split into chunks, each chunk is validated sequentially on a
+worker thread, and the chunks are collected in order. The first failing
+chunk therefore always holds the earliest failing index, and the raised
+ValidationError is the same one List.validate would raise.
+"""
+
+__author__ = 'schlitzer'
+
+import concurrent.futures
+import os
+import sys
+
+from validation import List, ValidationError
+
+
+def gil_enabled():
+    """ Check if the running interpreter has the GIL enabled
+
+    :return: Boolean
+    """
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    if is_gil_enabled is None:
+        return True
+    return is_gil_enabled()
+
+
+def _first_error(check, item, start, stop):
+    for pos in range(start, stop):
+        try:
+            check(item[pos])
+        except ValidationError as err:
+            return pos, err
+    return None
+
+
+def validate_batch(validator, items, workers=None, chunksize=2048, executor=None, force=False):
+    """ Validate every member of items against validator using a thread pool
+
+    :param validator: Type Validator Instance used for every member
+    :param items: Sequence supporting len() and indexing
+    :param workers: Optional number of threads, defaults to the number of CPUs
+    :param chunksize: Number of members validated per task
+    :param executor: Optional concurrent.futures.Executor to use instead of a private pool
+    :param force: Use threads even if the GIL is enabled
+    :return: None, ValidationError
+    """
+    check = validator.validate
+    length = len(items)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if length <= chunksize or (not force and (workers < 2 or gil_enabled())):
+        result = _first_error(check, items, 0, length)
+    elif executor is None:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            result = _run_chunks(pool, check, items, length, chunksize)
+    else:
+        result = _run_chunks(executor, check, items, length, chunksize)
+    if result is not None:
+        pos, err = result
+        raise type(err)("list position [{0}] {1}".format(pos, err))
+
+
+def _run_chunks(executor, check, items, length, chunksize):
+    futures = [
+        executor.submit(_first_error, check, items, start, min(start + chunksize, length))
+        for start in range(0, length, chunksize)
+    ]
+    try:
+        for future in futures:
+            result = future.result()
+            if result is not None:
+                return result
+        return None
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def validate_list(validator, item, workers=None, chunksize=2048, executor=None, force=False):
+    """ Validate item against a List Type Validator using a thread pool
+
+    :param validator: List Type Validator Instance
+    :param item: Sequence supporting len() and indexing
+    :param workers: Optional number of threads, defaults to the number of CPUs
+    :param chunksize: Number of list members validated per task
+    :param executor: Optional concurrent.futures.Executor to use instead of a private pool
+    :param force: Use threads even if the GIL is enabled
+    :return: None, ValidationError
+    """
+    if not isinstance(validator, List):
+        raise ValueError('validator is not a List')
+    if validator.unique:
+        validator.validate(item)
+        return
+    validator.validate_length(len(item))
+    validate_batch(
+        validator.validator, item, workers=workers, chunksize=chunksize, executor=executor, force=force
+    )